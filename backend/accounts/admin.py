@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import User, PlatformMessage, UserReport, SkillReport
+from .models import User, PlatformMessage, UserReport, SkillReport, ExportJob
 
 @admin.register(User)
 class CustomUserAdmin(UserAdmin):
@@ -106,3 +106,10 @@ class SkillReportAdmin(admin.ModelAdmin):
                 from django.utils import timezone
                 obj.resolved_at = timezone.now()
         super().save_model(request, obj, form, change)
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'export_type', 'status', 'requested_by', 'rows_written', 'created_at', 'expires_at')
+    list_filter = ('export_type', 'status', 'created_at')
+    ordering = ('-created_at',)
+    readonly_fields = ('file_size', 'rows_written', 'error', 'created_at', 'started_at', 'locked_by', 'heartbeat_at', 'finished_at')
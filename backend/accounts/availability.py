@@ -0,0 +1,61 @@
+"""
+Availability as a bitmask over day-part slots.
+
+User.availability ('weekends', 'evenings', ...) and SwapRequest.preferred_time
+('weekend-morning', ...) use different vocabularies. Both are mapped to a
+6-bit mask over (weekday, weekend) x (morning, afternoon, evening) and
+stored in an indexed availability_mask column next to the original field.
+
+Two masks are compatible when they share a slot. There are only 63 non-empty
+masks, so compatibility is a plain `availability_mask IN (...)` filter and
+the number of shared slots is a CASE over the same values. Neither needs a
+per-row check in Python. A blank availability counts as available any time.
+"""
+from django.db.models import Case, IntegerField, Value, When
+
+WEEKDAY_MORNING = 1 << 0
+WEEKDAY_AFTERNOON = 1 << 1
+WEEKDAY_EVENING = 1 << 2
+WEEKEND_MORNING = 1 << 3
+WEEKEND_AFTERNOON = 1 << 4
+WEEKEND_EVENING = 1 << 5
+
+WEEKDAYS = WEEKDAY_MORNING | WEEKDAY_AFTERNOON | WEEKDAY_EVENING
+WEEKENDS = WEEKEND_MORNING | WEEKEND_AFTERNOON | WEEKEND_EVENING
+ANY_TIME = WEEKDAYS | WEEKENDS
+
+USER_AVAILABILITY_MASKS = {
+    'weekdays': WEEKDAYS,
+    'weekends': WEEKENDS,
+    'evenings': WEEKDAY_EVENING | WEEKEND_EVENING,
+    'mornings': WEEKDAY_MORNING | WEEKEND_MORNING,
+    'flexible': ANY_TIME,
+}
+
+PREFERRED_TIME_MASKS = {
+    'weekday-morning': WEEKDAY_MORNING,
+    'weekday-afternoon': WEEKDAY_AFTERNOON,
+    'weekday-evening': WEEKDAY_EVENING,
+    'weekend-morning': WEEKEND_MORNING,
+    'weekend-afternoon': WEEKEND_AFTERNOON,
+    'weekend-evening': WEEKEND_EVENING,
+    'flexible': ANY_TIME,
+}
+
+def user_availability_mask(availability):
+    return USER_AVAILABILITY_MASKS.get(availability, ANY_TIME)
+
+def preferred_time_mask(preferred_time):
+    return PREFERRED_TIME_MASKS.get(preferred_time, ANY_TIME)
+
+def compatible_masks(mask):
+    """Every mask that shares at least one slot with `mask`"""
+    return [other for other in range(1, ANY_TIME + 1) if other & mask]
+
+def overlap(field, mask):
+    """Expression for the number of slots `field` shares with `mask`, 0 when none"""
+    return Case(
+        *[When(**{field: other}, then=Value(bin(other & mask).count('1'))) for other in compatible_masks(mask)],
+        default=Value(0),
+        output_field=IntegerField()
+    )
@@ -0,0 +1,8 @@
+"""
+Constants shared by the export and moderation modules.
+
+Kept apart from both so neither has to import the other for them.
+"""
+
+# Rows fetched per round trip when streaming large querysets with .iterator()
+CHUNK_SIZE = 2000
@@ -0,0 +1,131 @@
+"""
+Background report exports.
+
+ExportJob rows double as the queue: the API inserts a 'queued' job and the
+run_export_worker command claims jobs with a conditional UPDATE, so several
+workers can poll the same table without handing out a job twice. Finished
+files live under MEDIA_ROOT/exports/ until EXPORT_RETENTION has passed.
+
+A claimed job records its worker in locked_by, and a background thread
+refreshes heartbeat_at every EXPORT_HEARTBEAT_INTERVAL while it renders.
+Only jobs whose heartbeat is older than EXPORT_STALE_AFTER go back to the
+queue, so a long export on a live worker is never handed out again. Every
+later write is conditional on locked_by, so a worker that lost its job
+can't overwrite the result of the one that took it over.
+"""
+import os
+import socket
+import tempfile
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+from django.conf import settings
+from django.core.files import File
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+from .exports import EXPORTS, write_csv
+from .parallel_exports import PARTITIONED_EXPORTS, write_partitioned
+from .models import ExportJob
+
+def retention():
+    return getattr(settings, 'EXPORT_RETENTION', timedelta(days=7))
+
+def worker_id():
+    """Identifies this worker process in ExportJob.locked_by"""
+    return f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+
+def claim_next_job(locked_by):
+    """Mark the oldest queued job as running for `locked_by` and return it, or None when the queue is empty"""
+    for job_id in ExportJob.objects.filter(status='queued').order_by('created_at', 'id').values_list('id', flat=True)[:10]:
+        now = timezone.now()
+        claimed = ExportJob.objects.filter(pk=job_id, status='queued').update(
+            status='running', started_at=now, locked_by=locked_by, heartbeat_at=now
+        )
+        if claimed:
+            return ExportJob.objects.get(pk=job_id)
+    return None
+
+def owned(job):
+    """The job's row, as long as its worker still holds it"""
+    return ExportJob.objects.filter(pk=job.pk, status='running', locked_by=job.locked_by)
+
+@contextmanager
+def heartbeat(job):
+    """Refresh job.heartbeat_at from a background thread until the block exits"""
+    interval = getattr(settings, 'EXPORT_HEARTBEAT_INTERVAL', 30)
+    stop = threading.Event()
+
+    def beat():
+        try:
+            while not stop.wait(interval):
+                owned(job).update(heartbeat_at=timezone.now())
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=beat, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+def run_job(job):
+    filename, header, rows = EXPORTS[job.export_type]
+
+    def progress(rows_written):
+        owned(job).update(rows_written=rows_written)
+
+    workers = getattr(settings, 'EXPORT_WORKER_PROCESSES', 1)
+    try:
+        with heartbeat(job), tempfile.TemporaryFile('w+b') as raw:
+            if workers > 1 and job.export_type in PARTITIONED_EXPORTS:
+                written = write_partitioned(job.export_type, raw, workers, progress=progress)
+            else:
+                with open(raw.fileno(), 'w', encoding='utf-8', newline='', closefd=False) as text:
+                    written = write_csv(text, header, rows(), progress=progress)
+            raw.seek(0)
+            job.file.save(f'{job.pk}_{filename}', File(raw), save=False)
+    except Exception as exc:
+        job.status = 'failed'
+        job.error = str(exc)
+        job.finished_at = timezone.now()
+        owned(job).update(status=job.status, error=job.error, finished_at=job.finished_at)
+        raise
+
+    job.finished_at = timezone.now()
+    finished = owned(job).update(
+        status='completed',
+        file=job.file.name,
+        file_size=job.file.size,
+        rows_written=written,
+        finished_at=job.finished_at,
+        expires_at=job.finished_at + retention()
+    )
+    if not finished:
+        # Requeued and picked up by another worker meanwhile; its file wins
+        job.file.delete(save=False)
+        raise RuntimeError(f'{job} was taken over by another worker')
+    job.refresh_from_db()
+    return job
+
+def requeue_stale_jobs(stale_after=None):
+    """Put back running jobs whose worker stopped sending heartbeats"""
+    stale_after = stale_after or getattr(settings, 'EXPORT_STALE_AFTER', timedelta(minutes=5))
+    cutoff = timezone.now() - stale_after
+    return ExportJob.objects.filter(status='running').filter(
+        Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff)
+    ).update(status='queued', started_at=None, locked_by='', heartbeat_at=None, rows_written=0)
+
+def expire_jobs():
+    """Delete artifacts past their retention period; the job rows stay as 'expired'"""
+    expired = 0
+    for job in ExportJob.objects.filter(status='completed', expires_at__lte=timezone.now()):
+        if job.file:
+            job.file.delete(save=False)
+        job.status = 'expired'
+        job.save(update_fields=['status', 'file'])
+        expired += 1
+    return expired
@@ -0,0 +1,507 @@
+"""
+Exports for the admin report downloads.
+
+Each export is a header plus a generator of rows read with
+values_list(...).iterator(), so only one chunk of rows is in memory at a
+time. stream_export() turns those into a StreamingHttpResponse that starts
+sending as soon as the first rows are formatted, as CSV or NDJSON (one JSON
+object per line, keyed by the snake_cased header labels), optionally gzipped
+on the fly with a streaming zlib compressor.
+
+The swap, report-log and user-activity exports also take `since`, which
+limits them to rows changed after that moment (by updated_at). Responses
+carry an X-Export-Watermark header to pass back as `since` on the next run.
+The watermark is taken before the rows are read and the filter has no upper
+bound, so a row changed mid-export is sent again next time rather than
+missed; consumers should upsert by id. Deleted rows are not reported.
+"""
+import csv
+import heapq
+import json
+import re
+import zlib
+from datetime import datetime, time
+from operator import itemgetter
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.db.models import Q, F, Avg, Count, Max
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from swaps.models import SwapRequest, SwapRating
+from skills.models import UserSkill
+from .constants import CHUNK_SIZE
+from .models import User, UserReport, SkillReport
+from .moderation import moderation_events
+
+class Echo:
+    """Pseudo-buffer for csv.writer: write() hands the formatted line straight back"""
+    def write(self, value):
+        return value
+
+WATERMARK_HEADER = 'X-Export-Watermark'
+
+def parse_time_param(request, name, value=None):
+    """
+    Parse an ISO 8601 datetime (or date, meaning midnight) query parameter.
+    Returns None when absent; raises ValueError on a malformed value.
+    """
+    value = value or request.query_params.get(name)
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f'Invalid {name} value "{value}", expected an ISO 8601 datetime')
+        parsed = datetime.combine(day, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+def export_since(request):
+    """The `since` (or `cursor`) watermark of a delta export, or None for a full export"""
+    value = request.query_params.get('since') or request.query_params.get('cursor')
+    return parse_time_param(request, 'since', value)
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv', '.csv'),
+    'csv.gz': ('application/gzip', '.csv.gz'),
+    'ndjson': ('application/x-ndjson', '.ndjson'),
+    'ndjson.gz': ('application/gzip', '.ndjson.gz'),
+}
+
+def export_format(request):
+    """The `format` query parameter of a download; raises ValueError on an unknown format"""
+    fmt = request.query_params.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f'Invalid format "{fmt}". Choose from: {", ".join(EXPORT_FORMATS)}')
+    return fmt
+
+def json_key(label):
+    """'Reported User/Skill' -> 'reported_user_skill'"""
+    return re.sub(r'[^a-z0-9]+', '_', label.lower()).strip('_')
+
+def csv_chunks(header, rows, rows_per_chunk=500):
+    writer = csv.writer(Echo())
+    yield writer.writerow(header)
+    chunk = []
+    for row in rows:
+        chunk.append(writer.writerow(row))
+        if len(chunk) >= rows_per_chunk:
+            yield ''.join(chunk)
+            chunk = []
+    if chunk:
+        yield ''.join(chunk)
+
+def ndjson_chunks(header, rows, rows_per_chunk=500):
+    keys = [json_key(label) for label in header]
+    encoder = json.JSONEncoder(ensure_ascii=False, default=str)
+    chunk = []
+    for row in rows:
+        chunk.append(encoder.encode(dict(zip(keys, row))) + '\n')
+        if len(chunk) >= rows_per_chunk:
+            yield ''.join(chunk)
+            chunk = []
+    if chunk:
+        yield ''.join(chunk)
+
+def gzip_chunks(chunks):
+    """Gzip a stream of bytes incrementally; wbits=31 writes the gzip container"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def encode_chunks(chunks):
+    for chunk in chunks:
+        yield chunk.encode('utf-8')
+
+def export_response(filename, chunks, fmt='csv', watermark=None):
+    """
+    Wrap already-encoded CSV or NDJSON byte chunks in a download response,
+    gzipping them when `fmt` ends in .gz. `filename` is given without extension.
+    """
+    content_type, extension = EXPORT_FORMATS[fmt]
+    if fmt.endswith('.gz'):
+        chunks = gzip_chunks(chunks)
+    response = StreamingHttpResponse(chunks, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}{extension}"'
+    if watermark is not None:
+        response[WATERMARK_HEADER] = watermark.isoformat()
+    return response
+
+def stream_export(filename, header, rows, fmt='csv', watermark=None):
+    if fmt.startswith('ndjson'):
+        chunks = ndjson_chunks(header, rows)
+    else:
+        chunks = csv_chunks(header, rows)
+    return export_response(filename, encode_chunks(chunks), fmt, watermark)
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+def _read_range(fileobj, start, length, block_size=64 * 1024):
+    with fileobj:
+        fileobj.seek(start)
+        while length > 0:
+            data = fileobj.read(min(block_size, length))
+            if not data:
+                break
+            length -= len(data)
+            yield data
+
+def ranged_file_response(request, fieldfile, filename, content_type='text/csv'):
+    """
+    Serve a stored file, honouring a single-range `Range: bytes=...` header
+    so interrupted downloads of large exports can be resumed.
+    """
+    size = fieldfile.size
+    match = RANGE_RE.match(request.headers.get('Range', '').strip())
+    if not match or not any(match.groups()):
+        response = FileResponse(fieldfile.open('rb'), as_attachment=True, filename=filename, content_type=content_type)
+        response['Accept-Ranges'] = 'bytes'
+        return response
+
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        # Suffix range: the last N bytes
+        start = max(size - int(last), 0)
+        end = size - 1
+    if start > end or start >= size:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    length = end - start + 1
+    response = StreamingHttpResponse(_read_range(fieldfile.open('rb'), start, length), status=206, content_type=content_type)
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Content-Length'] = str(length)
+    response['Accept-Ranges'] = 'bytes'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+def format_datetime(value, default=''):
+    return value.strftime('%Y-%m-%d %H:%M:%S') if value else default
+
+def full_name(first_name, last_name):
+    return f"{first_name or ''} {last_name or ''}".strip()
+
+# Swap activity
+
+SWAP_REPORT_HEADER = [
+    'Swap ID', 'From User', 'To User', 'Skill Offered', 'Skill Wanted',
+    'Status', 'Duration', 'Preferred Time', 'Created At', 'Updated At'
+]
+
+SWAP_COLUMNS = (
+    'id', 'from_user__first_name', 'from_user__last_name',
+    'to_user__first_name', 'to_user__last_name',
+    'skill_offered__name', 'skill_wanted__name', 'status',
+    'duration', 'preferred_time', 'created_at', 'updated_at'
+)
+
+def id_range_filter(id_range):
+    """Q for a half-open [low, high) id partition, or an empty Q for no partition"""
+    if id_range is None:
+        return Q()
+    low, high = id_range
+    return Q(id__gte=low, id__lt=high)
+
+def swap_report_rows(since=None, id_range=None):
+    swaps = SwapRequest.objects.filter(id_range_filter(id_range))
+    if since is not None:
+        swaps = swaps.filter(updated_at__gt=since)
+    swaps = swaps.order_by('id').values_list(*SWAP_COLUMNS)
+    for (swap_id, from_first, from_last, to_first, to_last, skill_offered, skill_wanted,
+         swap_status, duration, preferred_time, created_at, updated_at) in swaps.iterator(chunk_size=CHUNK_SIZE):
+        yield [
+            swap_id, full_name(from_first, from_last), full_name(to_first, to_last),
+            skill_offered, skill_wanted, swap_status, duration, preferred_time,
+            format_datetime(created_at), format_datetime(updated_at)
+        ]
+
+# Report logs
+
+REPORT_LOG_HEADER = [
+    'Report ID', 'Type', 'Reporter', 'Reported User/Skill', 'Report Type',
+    'Description', 'Status', 'Admin Notes', 'Resolved By', 'Resolved At',
+    'Created At'
+]
+
+def _user_report_log_rows(changed):
+    user_reports = UserReport.objects.filter(changed).order_by('created_at', 'id').values_list(
+        'id', 'reporter__first_name', 'reporter__last_name',
+        'reported_user__first_name', 'reported_user__last_name', 'report_type',
+        'description', 'status', 'admin_notes', 'resolved_by__first_name',
+        'resolved_by__last_name', 'resolved_at', 'created_at'
+    )
+    for (report_id, reporter_first, reporter_last, target_first, target_last, report_type,
+         description, report_status, admin_notes, resolver_first, resolver_last,
+         resolved_at, created_at) in user_reports.iterator(chunk_size=CHUNK_SIZE):
+        yield created_at, [
+            f'UR-{report_id}', 'User Report', full_name(reporter_first, reporter_last),
+            full_name(target_first, target_last), report_type,
+            description[:100], report_status, admin_notes[:100],
+            full_name(resolver_first, resolver_last),
+            format_datetime(resolved_at), format_datetime(created_at)
+        ]
+
+def _skill_report_log_rows(changed):
+    skill_reports = SkillReport.objects.filter(changed).order_by('created_at', 'id').values_list(
+        'id', 'reporter__first_name', 'reporter__last_name', 'skill__name', 'report_type',
+        'description', 'status', 'admin_notes', 'resolved_by__first_name',
+        'resolved_by__last_name', 'resolved_at', 'created_at'
+    )
+    for (report_id, reporter_first, reporter_last, skill_name, report_type,
+         description, report_status, admin_notes, resolver_first, resolver_last,
+         resolved_at, created_at) in skill_reports.iterator(chunk_size=CHUNK_SIZE):
+        yield created_at, [
+            f'SR-{report_id}', 'Skill Report', full_name(reporter_first, reporter_last),
+            skill_name, report_type,
+            description[:100], report_status, admin_notes[:100],
+            full_name(resolver_first, resolver_last),
+            format_datetime(resolved_at), format_datetime(created_at)
+        ]
+
+def report_log_rows(since=None):
+    # Both report tables, interleaved by creation time
+    changed = Q(updated_at__gt=since) if since is not None else Q()
+    merged = heapq.merge(
+        _user_report_log_rows(changed), _skill_report_log_rows(changed), key=itemgetter(0)
+    )
+    for _, row in merged:
+        yield row
+
+# User activity
+
+USER_ACTIVITY_HEADER = [
+    'User ID', 'Username', 'Email', 'Full Name', 'Join Date', 'Last Login',
+    'Total Swaps', 'Completed Swaps', 'Average Rating', 'Reports Received',
+    'Reports Made', 'Is Banned', 'Ban Reason'
+]
+
+ENHANCED_USER_ACTIVITY_HEADER = [
+    'User ID', 'Username', 'Email', 'Full Name', 'Join Date', 'Last Login',
+    'Total Swaps', 'Completed Swaps', 'Cancelled Swaps', 'Average Rating',
+    'Reports Received', 'Reports Made', 'Is Banned', 'Ban Reason',
+    'Total Skills Offered', 'Total Skills Wanted'
+]
+
+class MergeLookup:
+    """
+    Look up rows of a grouped queryset by user id while walking users in id
+    order. Both sides are sorted by id, so this is a streaming merge join:
+    each grouped query is read once, a chunk at a time.
+    """
+    def __init__(self, queryset, key):
+        self.key = key
+        self.rows = queryset.order_by(key).iterator(chunk_size=CHUNK_SIZE)
+        self.current = next(self.rows, None)
+
+    def get(self, user_id):
+        while self.current is not None and self.current[self.key] < user_id:
+            self.current = next(self.rows, None)
+        if self.current is not None and self.current[self.key] == user_id:
+            return self.current
+        return {}
+
+def _for_users(queryset, key, user_ids):
+    return queryset if user_ids is None else queryset.filter(**{f'{key}__in': user_ids})
+
+def _swap_counts(key, user_ids):
+    return MergeLookup(
+        _for_users(SwapRequest.objects.all(), key, user_ids).values(key).annotate(
+            total=Count('id'),
+            completed=Count('id', filter=Q(status='completed')),
+            cancelled=Count('id', filter=Q(status='cancelled')),
+        ),
+        key
+    )
+
+def changed_users(since):
+    """
+    Users whose activity row may differ from the last export: the user
+    itself changed or logged in, or a swap or report involving them did.
+    Logins save only last_login, so they don't move updated_at. Deleting a
+    swap or report moves both users' updated_at, and saving or deleting a
+    rating moves its swap's (see accounts.signals).
+    """
+    changed_swaps = SwapRequest.objects.filter(updated_at__gt=since)
+    changed_reports = UserReport.objects.filter(updated_at__gt=since)
+    return User.objects.filter(
+        Q(updated_at__gt=since) |
+        Q(last_login__gt=since) |
+        Q(id__in=changed_swaps.values('from_user')) |
+        Q(id__in=changed_swaps.values('to_user')) |
+        Q(id__in=changed_reports.values('reporter')) |
+        Q(id__in=changed_reports.values('reported_user'))
+    )
+
+def user_activity_rows(enhanced=False, since=None):
+    if since is None:
+        users, user_ids = User.objects.all(), None
+    else:
+        users = changed_users(since)
+        user_ids = users.values('id')
+    sent = _swap_counts('from_user', user_ids)
+    received = _swap_counts('to_user', user_ids)
+    rating_key = 'swap_session__swap_request__from_user'
+    ratings = MergeLookup(
+        _for_users(SwapRating.objects.all(), rating_key, user_ids).values(rating_key).annotate(
+            avg_rating=Avg('rating')
+        ),
+        rating_key
+    )
+    reports_received = MergeLookup(
+        _for_users(UserReport.objects.all(), 'reported_user', user_ids).values('reported_user').annotate(total=Count('id')),
+        'reported_user'
+    )
+    reports_made = MergeLookup(
+        _for_users(UserReport.objects.all(), 'reporter', user_ids).values('reporter').annotate(total=Count('id')),
+        'reporter'
+    )
+    if enhanced:
+        skills = MergeLookup(
+            _for_users(UserSkill.objects.all(), 'user', user_ids).values('user').annotate(
+                offered=Count('id', filter=Q(skill_type='offered')),
+                wanted=Count('id', filter=Q(skill_type='wanted')),
+            ),
+            'user'
+        )
+
+    users = users.order_by('id').values_list(
+        'id', 'username', 'email', 'first_name', 'last_name', 'created_at',
+        'last_login', 'is_banned', 'ban_reason'
+    )
+    for (user_id, username, email, first_name, last_name, created_at,
+         last_login, is_banned, ban_reason) in users.iterator(chunk_size=CHUNK_SIZE):
+        user_sent = sent.get(user_id)
+        user_received = received.get(user_id)
+        total_swaps = user_sent.get('total', 0) + user_received.get('total', 0)
+        completed_swaps = user_sent.get('completed', 0) + user_received.get('completed', 0)
+        average_rating = round(ratings.get(user_id).get('avg_rating') or 0.0, 2)
+
+        row = [
+            user_id, username, email, full_name(first_name, last_name),
+            format_datetime(created_at), format_datetime(last_login, 'Never'),
+            total_swaps, completed_swaps
+        ]
+        if enhanced:
+            row.append(user_sent.get('cancelled', 0) + user_received.get('cancelled', 0))
+        row += [
+            average_rating,
+            reports_received.get(user_id).get('total', 0),
+            reports_made.get(user_id).get('total', 0),
+            is_banned, ban_reason or ''
+        ]
+        if enhanced:
+            user_skills = skills.get(user_id)
+            row += [user_skills.get('offered', 0), user_skills.get('wanted', 0)]
+        yield row
+
+# Swap analytics
+
+SWAP_ANALYTICS_HEADER = [
+    'Swap ID', 'From User', 'To User', 'Skill Offered', 'Skill Wanted',
+    'Status', 'Duration', 'Preferred Time', 'Created At', 'Updated At',
+    'Completion Date', 'Rating Given', 'Rating Received', 'Average Rating',
+    'Rating Count'
+]
+
+def swap_analytics_rows(id_range=None):
+    # One query: the session comes in through the one-to-one join and the
+    # ratings are aggregated per swap. A session has at most one rating per
+    # user, so Max() over a filtered rater is that user's rating.
+    ratings = 'swapsession__ratings'
+    swaps = SwapRequest.objects.filter(id_range_filter(id_range)).order_by('id').values_list(
+        *SWAP_COLUMNS, 'swapsession__completed', 'swapsession__scheduled_date'
+    ).annotate(
+        rating_given=Max(f'{ratings}__rating', filter=Q(**{f'{ratings}__from_user': F('from_user')})),
+        rating_received=Max(f'{ratings}__rating', filter=~Q(**{f'{ratings}__from_user': F('from_user')})),
+        average_rating=Avg(f'{ratings}__rating'),
+        rating_count=Count(f'{ratings}__id'),
+    )
+    for (swap_id, from_first, from_last, to_first, to_last, skill_offered, skill_wanted,
+         swap_status, duration, preferred_time, created_at, updated_at, session_completed,
+         scheduled_date, rating_given, rating_received, average_rating,
+         rating_count) in swaps.iterator(chunk_size=CHUNK_SIZE):
+        completion_date = ''
+        if swap_status != 'completed':
+            # Ratings only count for completed swaps
+            rating_given = rating_received = average_rating = rating_count = None
+        elif session_completed:
+            completion_date = format_datetime(scheduled_date)
+
+        yield [
+            swap_id, full_name(from_first, from_last), full_name(to_first, to_last),
+            skill_offered, skill_wanted, swap_status, duration, preferred_time,
+            format_datetime(created_at), format_datetime(updated_at), completion_date,
+            '' if rating_given is None else rating_given,
+            '' if rating_received is None else rating_received,
+            '' if average_rating is None else round(average_rating, 2),
+            '' if rating_count is None else rating_count
+        ]
+
+# Moderation log
+
+MODERATION_LOG_HEADER = [
+    'Action Type', 'Target', 'Action By', 'Action Date', 'Reason/Notes',
+    'Status', 'Related Reports'
+]
+
+def moderation_log_rows(since=None, until=None):
+    # Bans and report resolutions, merged in time order
+    events = moderation_events(
+        ['ban', 'user_report_resolution', 'skill_report_resolution'], since=since, until=until
+    )
+    for event in events:
+        data = event.data
+        if event.kind == 'ban':
+            yield [
+                'User Ban', full_name(data['first_name'], data['last_name']),
+                full_name(data['banned_by__first_name'], data['banned_by__last_name']) or 'System',
+                format_datetime(data['ban_date']), data['ban_reason'] or '', 'Active', ''
+            ]
+            continue
+
+        if event.kind == 'user_report_resolution':
+            action_type = 'User Report Resolution'
+            target = full_name(data['reported_user__first_name'], data['reported_user__last_name'])
+        else:
+            action_type = 'Skill Report Resolution'
+            target = data['skill__name']
+        yield [
+            action_type, target,
+            full_name(data['resolved_by__first_name'], data['resolved_by__last_name']) or 'System',
+            format_datetime(data['resolved_at']), data['admin_notes'] or '', data['status'],
+            event.object_id
+        ]
+
+# Registry of exports, keyed by the name used for background export jobs
+
+EXPORTS = {
+    'user_activity': ('user_activity_report.csv', USER_ACTIVITY_HEADER, user_activity_rows),
+    'enhanced_user_activity': (
+        'enhanced_user_activity_report.csv', ENHANCED_USER_ACTIVITY_HEADER,
+        lambda since=None: user_activity_rows(enhanced=True, since=since)
+    ),
+    'swap_activity': ('swap_activity_report.csv', SWAP_REPORT_HEADER, swap_report_rows),
+    'report_logs': ('report_logs.csv', REPORT_LOG_HEADER, report_log_rows),
+    'swap_analytics': ('swap_analytics_report.csv', SWAP_ANALYTICS_HEADER, swap_analytics_rows),
+    'moderation_log': ('moderation_log_report.csv', MODERATION_LOG_HEADER, moderation_log_rows),
+}
+
+def write_csv(fileobj, header, rows, progress=None, progress_every=5000):
+    """Write an export to a text file; `progress(rows_written)` is called every `progress_every` rows"""
+    writer = csv.writer(fileobj)
+    writer.writerow(header)
+    written = 0
+    for row in rows:
+        writer.writerow(row)
+        written += 1
+        if progress and written % progress_every == 0:
+            progress(written)
+    return written
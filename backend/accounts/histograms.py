@@ -0,0 +1,50 @@
+"""
+Cached status histograms.
+
+status_histogram() counts every status of a model in one grouped query and
+keeps the result in the Django cache for STATUS_HISTOGRAM_TIMEOUT seconds.
+Each model has a version key in the cache. invalidate_status_histogram()
+replaces it, which orphans every cached histogram of that model at once.
+It is called from the same places that keep the daily rollups in step:
+the save/delete signals, swaps.transitions and update_status_in_bulk().
+"""
+import hashlib
+import uuid
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+def _version_key(model):
+    return f'status_histogram:{model._meta.label_lower}:version'
+
+def _version(model):
+    version = cache.get(_version_key(model))
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.set(_version_key(model), version, None)
+    return version
+
+def invalidate_status_histogram(model):
+    # After commit, so a reader can't re-cache the pre-commit counts under the new version
+    transaction.on_commit(lambda: cache.set(_version_key(model), uuid.uuid4().hex, None))
+
+def status_choices(model):
+    return [value for value, _ in model._meta.get_field('status').choices]
+
+def status_histogram(model, **filters):
+    """
+    Return ({status: count}, total) for rows of `model` matching `filters`.
+    Every declared status is present, zero-filled.
+    """
+    filter_key = hashlib.md5(repr(sorted(filters.items())).encode()).hexdigest()
+    key = f'status_histogram:{model._meta.label_lower}:{_version(model)}:{filter_key}'
+    counts = cache.get(key)
+    if counts is None:
+        counts = dict(
+            model.objects.filter(**filters).order_by().values_list('status').annotate(total=Count('id'))
+        )
+        cache.set(key, counts, getattr(settings, 'STATUS_HISTOGRAM_TIMEOUT', 30))
+
+    histogram = {status: counts.get(status, 0) for status in status_choices(model)}
+    return histogram, sum(counts.values())
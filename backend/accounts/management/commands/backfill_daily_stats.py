@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from accounts.rollups import rebuild_daily_stats
+
+class Command(BaseCommand):
+    help = 'Recompute the daily statistics rollups from the source tables'
+
+    def handle(self, *args, **options):
+        rows = rebuild_daily_stats()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} daily stat rows'))
@@ -0,0 +1,46 @@
+import os
+import time
+from django.core.management.base import BaseCommand, CommandError
+from accounts.exports import write_csv
+from accounts.parallel_exports import PARTITIONED_EXPORTS, write_partitioned
+
+class Command(BaseCommand):
+    help = 'Measure partitioned export throughput for increasing process pool sizes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--export', default='swap_analytics', choices=sorted(PARTITIONED_EXPORTS))
+        parser.add_argument('--workers', type=int, nargs='+', default=None, help='Pool sizes to try (default: 1 2 4 ... up to the core count)')
+        parser.add_argument('--partitions-per-worker', type=int, default=4)
+
+    def handle(self, *args, **options):
+        export_name = options['export']
+        _, header, rows = PARTITIONED_EXPORTS[export_name]
+        workers_list = options['workers'] or self.default_workers()
+
+        with open(os.devnull, 'w', encoding='utf-8', newline='') as sink:
+            start = time.perf_counter()
+            total = write_csv(sink, header, rows())
+            baseline = time.perf_counter() - start
+        if not total:
+            raise CommandError(f'Nothing to export for {export_name}')
+        self.stdout.write(f'serial      {total} rows in {baseline:.2f}s ({total / baseline:,.0f} rows/s)')
+
+        for workers in workers_list:
+            with open(os.devnull, 'wb') as sink:
+                start = time.perf_counter()
+                written = write_partitioned(
+                    export_name, sink, workers, partitions=workers * options['partitions_per_worker']
+                )
+                elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f'{workers:2d} workers  {written} rows in {elapsed:.2f}s '
+                f'({written / elapsed:,.0f} rows/s, {baseline / elapsed:.2f}x serial)'
+            )
+        self.stdout.write(self.style.SUCCESS('Benchmark complete'))
+
+    def default_workers(self):
+        cores = os.cpu_count() or 1
+        counts = [1]
+        while counts[-1] * 2 <= cores:
+            counts.append(counts[-1] * 2)
+        return counts
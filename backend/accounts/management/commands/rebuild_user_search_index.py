@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from accounts.search import get_search_backend
+
+class Command(BaseCommand):
+    help = 'Rebuild the user directory search index from scratch'
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        indexed = backend.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt {backend.__class__.__name__} index ({indexed} users)')
+        )
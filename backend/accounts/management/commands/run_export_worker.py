@@ -0,0 +1,34 @@
+import time
+from django.core.management.base import BaseCommand
+from accounts.export_jobs import claim_next_job, run_job, expire_jobs, requeue_stale_jobs, worker_id
+
+class Command(BaseCommand):
+    help = 'Process queued report export jobs and delete expired export files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Drain the queue once and exit')
+        parser.add_argument('--poll-interval', type=float, default=5.0, help='Seconds to sleep when the queue is empty')
+
+    def handle(self, *args, **options):
+        locked_by = worker_id()
+        while True:
+            requeued = requeue_stale_jobs()
+            if requeued:
+                self.stdout.write(self.style.WARNING(f'Requeued {requeued} stale export jobs'))
+            expired = expire_jobs()
+            if expired:
+                self.stdout.write(f'Expired {expired} export files')
+
+            job = claim_next_job(locked_by)
+            while job is not None:
+                self.stdout.write(f'Running {job}')
+                try:
+                    run_job(job)
+                    self.stdout.write(self.style.SUCCESS(f'Finished {job}: {job.rows_written} rows'))
+                except Exception as exc:
+                    self.stdout.write(self.style.ERROR(f'Failed {job}: {exc}'))
+                job = claim_next_job(locked_by)
+
+            if options['once']:
+                return
+            time.sleep(options['poll_interval'])
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-17 17:51
+
+from django.db import migrations, models
+
+
+def backfill_skill_summaries(apps, schema_editor):
+    User = apps.get_model('accounts', 'User')
+    UserSkill = apps.get_model('skills', 'UserSkill')
+
+    summaries = {}
+    rows = UserSkill.objects.order_by('id').values_list('user_id', 'skill_type', 'skill__name')
+    for user_id, skill_type, name in rows.iterator():
+        summary = summaries.setdefault(user_id, {'offered': [], 'wanted': []})
+        summary[skill_type].append(name)
+
+    for user_id, summary in summaries.items():
+        User.objects.filter(pk=user_id).update(
+            skills_offered_summary=summary['offered'],
+            skills_wanted_summary=summary['wanted'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_user_ban_date_user_ban_reason_user_banned_by_and_more'),
+        ('skills', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='skills_offered_summary',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='skills_wanted_summary',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.RunPython(backfill_skill_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-17 17:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_user_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='skillreport',
+            index=models.Index(fields=['created_at', 'id'], name='skillreport_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['created_at', 'id'], name='user_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userreport',
+            index=models.Index(fields=['created_at', 'id'], name='userreport_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 4.2.30 on 2026-10-17 17:57
+
+from collections import defaultdict
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_daily_stats(apps, schema_editor):
+    DailyStat = apps.get_model('accounts', 'DailyStat')
+    counters = defaultdict(int)
+
+    def collect(model, prefix, by_status=True):
+        fields = ['day', 'status'] if by_status else ['day']
+        rows = model.objects.annotate(day=TruncDate('created_at')).values(*fields).annotate(
+            count=Count('id')
+        ).order_by()
+        for row in rows:
+            metric = f"{prefix}.{row['status']}" if by_status else f'{prefix}.new'
+            counters[(row['day'], metric)] += row['count']
+
+    collect(apps.get_model('accounts', 'User'), 'users', by_status=False)
+    collect(apps.get_model('swaps', 'SwapRequest'), 'swaps')
+    collect(apps.get_model('accounts', 'UserReport'), 'user_reports')
+    collect(apps.get_model('accounts', 'SkillReport'), 'skill_reports')
+
+    ratings = apps.get_model('swaps', 'SwapRating').objects.annotate(day=TruncDate('created_at')).values(
+        'day'
+    ).annotate(count=Count('id'), total=Sum('rating')).order_by()
+    for row in ratings:
+        counters[(row['day'], 'ratings.count')] += row['count']
+        counters[(row['day'], 'ratings.sum')] += row['total'] or 0
+
+    DailyStat.objects.bulk_create(
+        [DailyStat(date=day, metric=metric, value=value) for (day, metric), value in counters.items()],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_created_id_indexes'),
+        ('swaps', '0003_swap_cycles'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('metric', models.CharField(max_length=50)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['date', 'metric'],
+                'indexes': [models.Index(fields=['metric', 'date'], name='dailystat_metric_date_idx')],
+                'unique_together': {('date', 'metric')},
+            },
+        ),
+        migrations.RunPython(backfill_daily_stats, migrations.RunPython.noop),
+    ]
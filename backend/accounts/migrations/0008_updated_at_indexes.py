@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-17 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_export_jobs'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='skillreport',
+            index=models.Index(fields=['updated_at'], name='skillreport_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['updated_at'], name='user_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userreport',
+            index=models.Index(fields=['updated_at'], name='userreport_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-17 18:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_updated_at_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='skillreport',
+            index=models.Index(fields=['resolved_at', 'id'], name='skillreport_resolved_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['ban_date', 'id'], name='user_ban_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userreport',
+            index=models.Index(fields=['resolved_at', 'id'], name='userreport_resolved_idx'),
+        ),
+    ]
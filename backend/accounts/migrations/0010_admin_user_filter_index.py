@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-17 18:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_moderation_time_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['is_banned', 'created_at'], name='user_banned_created_idx'),
+        ),
+    ]
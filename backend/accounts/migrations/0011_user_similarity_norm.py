@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-17 18:16
+
+import math
+from django.db import migrations, models
+
+PROFICIENCY_WEIGHTS = {
+    'beginner': 1.0,
+    'intermediate': 2.0,
+    'advanced': 3.0,
+    'expert': 4.0,
+}
+
+
+def backfill_similarity_norms(apps, schema_editor):
+    User = apps.get_model('accounts', 'User')
+    UserSkill = apps.get_model('skills', 'UserSkill')
+
+    squares = {}
+    for user_id, skill_type, level in UserSkill.objects.values_list('user_id', 'skill_type', 'proficiency_level'):
+        weight = 1.0 if skill_type == 'wanted' else PROFICIENCY_WEIGHTS.get(level, 2.0)
+        squares[user_id] = squares.get(user_id, 0.0) + weight ** 2
+
+    for user_id, experience_level, availability in User.objects.values_list(
+        'pk', 'experience_level', 'availability'
+    ).iterator():
+        norm = math.sqrt(squares.get(user_id, 0.0) + bool(experience_level) + bool(availability))
+        User.objects.filter(pk=user_id).update(similarity_norm=norm)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_admin_user_filter_index'),
+        ('skills', '0003_skill_cooccurrence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='similarity_norm',
+            field=models.FloatField(default=0),
+        ),
+        migrations.RunPython(backfill_similarity_norms, migrations.RunPython.noop),
+    ]
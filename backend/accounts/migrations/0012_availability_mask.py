@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-17 18:17
+
+from django.db import migrations, models
+
+
+USER_AVAILABILITY_MASKS = {
+    'weekdays': 0b000111,
+    'weekends': 0b111000,
+    'evenings': 0b100100,
+    'mornings': 0b001001,
+    'flexible': 0b111111,
+}
+
+
+def backfill_user_masks(apps, schema_editor):
+    User = apps.get_model('accounts', 'User')
+    for value, mask in USER_AVAILABILITY_MASKS.items():
+        User.objects.filter(availability=value).update(availability_mask=mask)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_user_similarity_norm'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='availability_mask',
+            field=models.PositiveSmallIntegerField(default=63),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['availability_mask'], name='user_availability_mask_idx'),
+        ),
+        migrations.RunPython(backfill_user_masks, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from .availability import ANY_TIME, user_availability_mask
 
 class User(AbstractUser):
     email = models.EmailField(unique=True)
@@ -13,6 +14,8 @@ class User(AbstractUser):
         ('mornings', 'Mornings'),
         ('flexible', 'Flexible'),
     ], blank=True)
+    # Day-part slots covered by `availability` (see accounts/availability.py), set on save
+    availability_mask = models.PositiveSmallIntegerField(default=ANY_TIME)
     experience_level = models.CharField(max_length=50, choices=[
         ('beginner', 'Beginner (0-1 years)'),
         ('intermediate', 'Intermediate (2-4 years)'),
@@ -36,12 +39,34 @@ class User(AbstractUser):
     ban_date = models.DateTimeField(null=True, blank=True)
     banned_by = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True, related_name='bans_given')
 
+    # Denormalized skill names, kept in sync by skills.signals
+    skills_offered_summary = models.JSONField(default=list, blank=True)
+    skills_wanted_summary = models.JSONField(default=list, blank=True)
+    # Length of the profile vector used by skills.similarity, kept in sync by skills.signals
+    similarity_norm = models.FloatField(default=0)
+
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', 'first_name', 'last_name']
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='user_created_id_idx'),
+            models.Index(fields=['updated_at'], name='user_updated_idx'),
+            models.Index(fields=['ban_date', 'id'], name='user_ban_date_idx'),
+            models.Index(fields=['is_banned', 'created_at'], name='user_banned_created_idx'),
+            models.Index(fields=['availability_mask'], name='user_availability_mask_idx'),
+        ]
+
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
+    def save(self, *args, **kwargs):
+        self.availability_mask = user_availability_mask(self.availability)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'availability' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'availability_mask'}
+        super().save(*args, **kwargs)
+
     @property
     def full_name(self):
         return f"{self.first_name} {self.last_name}".strip()
@@ -101,6 +126,11 @@ class UserReport(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='userreport_created_id_idx'),
+            models.Index(fields=['updated_at'], name='userreport_updated_idx'),
+            models.Index(fields=['resolved_at', 'id'], name='userreport_resolved_idx'),
+        ]
     
     def __str__(self):
         return f"Report by {self.reporter.full_name} on {self.reported_user.full_name}"
@@ -135,6 +165,62 @@ class SkillReport(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='skillreport_created_id_idx'),
+            models.Index(fields=['updated_at'], name='skillreport_updated_idx'),
+            models.Index(fields=['resolved_at', 'id'], name='skillreport_resolved_idx'),
+        ]
     
     def __str__(self):
         return f"Skill report by {self.reporter.full_name} on {self.skill.name}"
+
+class DailyStat(models.Model):
+    """Per-day counter for admin statistics, maintained incrementally by accounts.rollups"""
+    date = models.DateField()
+    metric = models.CharField(max_length=50)
+    value = models.BigIntegerField(default=0)
+    
+    class Meta:
+        ordering = ['date', 'metric']
+        unique_together = ['date', 'metric']
+        indexes = [
+            models.Index(fields=['metric', 'date'], name='dailystat_metric_date_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.date} {self.metric}: {self.value}"
+
+class ExportJob(models.Model):
+    """A report export rendered to MEDIA_ROOT by the run_export_worker command"""
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+        ('expired', 'Expired'),
+    ]
+    
+    export_type = models.CharField(max_length=50)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='export_jobs')
+    file = models.FileField(upload_to='exports/', blank=True)
+    file_size = models.BigIntegerField(default=0)
+    rows_written = models.IntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # Worker running the job and when it last reported in (see accounts/export_jobs.py)
+    locked_by = models.CharField(max_length=100, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='exportjob_status_created_idx'),
+            models.Index(fields=['status', 'expires_at'], name='exportjob_status_expires_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.export_type} export #{self.pk} ({self.status})"
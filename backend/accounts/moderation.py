@@ -0,0 +1,97 @@
+"""
+Unified moderation event stream.
+
+Bans, reports filed and report resolutions live in three tables. Each event
+source reads one of them in time order, and moderation_events() merges the
+sources lazily with heapq.merge. Memory use is one chunk per source however
+long the time range is, and a caller that stops after N events only reads
+about N rows from each table.
+
+Events with no timestamp (bans and resolutions recorded before those
+columns were filled in) sort before everything else in ascending order, and
+are dropped as soon as a time range is given.
+"""
+import heapq
+from collections import namedtuple
+from datetime import datetime, timezone as dt_timezone
+from itertools import islice
+from django.db.models import F
+from .constants import CHUNK_SIZE
+from .models import User, UserReport, SkillReport
+
+ModerationEvent = namedtuple('ModerationEvent', ['at', 'kind', 'object_id', 'data'])
+
+EARLIEST = datetime.min.replace(tzinfo=dt_timezone.utc)
+
+USER_REPORT_RESOLVED_STATUSES = ['resolved', 'dismissed']
+SKILL_REPORT_RESOLVED_STATUSES = ['approved', 'rejected', 'skill_removed']
+
+def _source(queryset, time_field, kind, since, until, descending, limit, *fields):
+    if since is not None:
+        queryset = queryset.filter(**{f'{time_field}__gte': since})
+    if until is not None:
+        queryset = queryset.filter(**{f'{time_field}__lt': until})
+    if descending:
+        queryset = queryset.order_by(F(time_field).desc(nulls_last=True), '-id')
+    else:
+        queryset = queryset.order_by(F(time_field).asc(nulls_first=True), 'id')
+    rows = queryset.values('id', time_field, *fields)
+    if limit is not None:
+        rows = rows[:limit]
+    for row in rows.iterator(chunk_size=CHUNK_SIZE):
+        yield ModerationEvent(row[time_field] or EARLIEST, kind, row['id'], row)
+
+def ban_events(since=None, until=None, descending=False, limit=None):
+    return _source(
+        User.objects.filter(is_banned=True), 'ban_date', 'ban', since, until, descending, limit,
+        'first_name', 'last_name', 'ban_reason', 'banned_by__first_name', 'banned_by__last_name'
+    )
+
+def user_report_events(since=None, until=None, descending=False, limit=None):
+    return _source(
+        UserReport.objects.all(), 'created_at', 'user_report', since, until, descending, limit,
+        'reporter__first_name', 'reporter__last_name', 'reported_user__first_name',
+        'reported_user__last_name', 'report_type', 'status'
+    )
+
+def skill_report_events(since=None, until=None, descending=False, limit=None):
+    return _source(
+        SkillReport.objects.all(), 'created_at', 'skill_report', since, until, descending, limit,
+        'reporter__first_name', 'reporter__last_name', 'skill__name', 'report_type', 'status'
+    )
+
+def user_report_resolution_events(since=None, until=None, descending=False, limit=None):
+    return _source(
+        UserReport.objects.filter(status__in=USER_REPORT_RESOLVED_STATUSES), 'resolved_at',
+        'user_report_resolution', since, until, descending, limit,
+        'reported_user__first_name', 'reported_user__last_name', 'resolved_by__first_name',
+        'resolved_by__last_name', 'admin_notes', 'status'
+    )
+
+def skill_report_resolution_events(since=None, until=None, descending=False, limit=None):
+    return _source(
+        SkillReport.objects.filter(status__in=SKILL_REPORT_RESOLVED_STATUSES), 'resolved_at',
+        'skill_report_resolution', since, until, descending, limit,
+        'skill__name', 'resolved_by__first_name', 'resolved_by__last_name', 'admin_notes', 'status'
+    )
+
+EVENT_SOURCES = {
+    'ban': ban_events,
+    'user_report': user_report_events,
+    'skill_report': skill_report_events,
+    'user_report_resolution': user_report_resolution_events,
+    'skill_report_resolution': skill_report_resolution_events,
+}
+
+def moderation_events(kinds, since=None, until=None, descending=False, limit=None):
+    """
+    Merge the event sources named in `kinds` into one stream ordered by time,
+    oldest first (or newest first with `descending`). `since` is inclusive,
+    `until` exclusive; `limit` caps the number of events returned.
+    """
+    sources = [
+        EVENT_SOURCES[kind](since=since, until=until, descending=descending, limit=limit)
+        for kind in kinds
+    ]
+    events = heapq.merge(*sources, key=lambda event: event.at, reverse=descending)
+    return islice(events, limit) if limit is not None else events
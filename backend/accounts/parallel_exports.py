@@ -0,0 +1,97 @@
+"""
+Partitioned export rendering across a process pool.
+
+Formatting CSV rows is CPU-bound and a single Python process tops out at
+one core. For exports over SwapRequest, the id space is split into
+half-open [low, high) ranges. Each range is rendered to its own temporary
+file by a worker process, and the files are concatenated in id order, so
+the output is byte-for-byte the same as the serial export.
+
+Database connections are closed before the pool starts and again in each
+worker, so no process shares a connection inherited through fork(). That is
+only safe outside a web request, so the pool is used by run_export_worker
+(EXPORT_WORKER_PROCESSES) and benchmark_parallel_export, never by a view.
+"""
+import csv
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import django
+from django.db import connections
+from django.db.models import Min, Max
+from swaps.models import SwapRequest
+from .exports import Echo, SWAP_REPORT_HEADER, swap_report_rows, SWAP_ANALYTICS_HEADER, swap_analytics_rows
+
+PARTITIONED_EXPORTS = {
+    'swap_activity': (SwapRequest, SWAP_REPORT_HEADER, swap_report_rows),
+    'swap_analytics': (SwapRequest, SWAP_ANALYTICS_HEADER, swap_analytics_rows),
+}
+
+def partition_ids(model, partitions):
+    """Split the id space of `model` into at most `partitions` [low, high) ranges"""
+    bounds = model.objects.aggregate(low=Min('id'), high=Max('id'))
+    if bounds['low'] is None:
+        return []
+    low, high = bounds['low'], bounds['high'] + 1
+    step = max((high - low + partitions - 1) // partitions, 1)
+    return [(start, min(start + step, high)) for start in range(low, high, step)]
+
+def _init_worker():
+    django.setup()
+    connections.close_all()
+
+def render_partition(export_name, id_range, directory):
+    """Write one partition's rows (no header) to a file in `directory`; returns (path, rows)"""
+    _, _, rows = PARTITIONED_EXPORTS[export_name]
+    path = os.path.join(directory, f'{export_name}-{id_range[0]}.csv')
+    written = 0
+    with open(path, 'w', encoding='utf-8', newline='') as fileobj:
+        writer = csv.writer(fileobj)
+        for row in rows(id_range=id_range):
+            writer.writerow(row)
+            written += 1
+    return path, written
+
+def partitioned_chunks(export_name, workers, partitions=None, progress=None, block_size=256 * 1024):
+    """
+    Yield the encoded CSV export in order, as bytes blocks, while later
+    partitions are still being rendered. `progress(rows_written)` is called
+    after each partition.
+    """
+    model, header, _ = PARTITIONED_EXPORTS[export_name]
+    ranges = partition_ids(model, partitions or workers * 4)
+    directory = tempfile.mkdtemp(prefix=f'{export_name}-')
+    connections.close_all()
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            yield csv.writer(Echo()).writerow(header).encode('utf-8')
+
+            results = pool.map(render_partition, [export_name] * len(ranges), ranges, [directory] * len(ranges))
+            rows_written = 0
+            for path, partition_rows in results:
+                with open(path, 'rb') as fileobj:
+                    while True:
+                        block = fileobj.read(block_size)
+                        if not block:
+                            break
+                        yield block
+                os.remove(path)
+                rows_written += partition_rows
+                if progress:
+                    progress(rows_written)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+def write_partitioned(export_name, fileobj, workers, partitions=None, progress=None):
+    """Render an export into a binary file object; returns the number of rows written"""
+    counter = {'rows': 0}
+
+    def track(rows_written):
+        counter['rows'] = rows_written
+        if progress:
+            progress(rows_written)
+
+    for block in partitioned_chunks(export_name, workers, partitions, progress=track):
+        fileobj.write(block)
+    return counter['rows']
@@ -0,0 +1,137 @@
+"""
+Daily statistics rollups.
+
+DailyStat keeps one counter per (date, metric) so the admin dashboards read
+a few hundred small rows instead of counting the underlying tables. Metrics:
+
+    users.new                  users created that day
+    swaps.<status>             swaps created that day, by current status
+    user_reports.<status>      user reports created that day, by current status
+    skill_reports.<status>     skill reports created that day, by current status
+    ratings.count, ratings.sum swap ratings given that day
+
+Counters are updated from accounts.signals on model writes, and from the
+code paths that change status with queryset.update() (swaps.transitions and
+the admin skill moderation view). rebuild_daily_stats() recomputes
+everything from scratch and backs the backfill_daily_stats command.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from django.apps import apps as global_apps
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from .histograms import invalidate_status_histogram
+
+def stat_date(value):
+    return timezone.localtime(value).date() if timezone.is_aware(value) else value.date()
+
+def bump(date, metric, delta=1):
+    if not delta:
+        return
+    DailyStat = global_apps.get_model('accounts', 'DailyStat')
+    if DailyStat.objects.filter(date=date, metric=metric).update(value=F('value') + delta):
+        return
+    try:
+        with transaction.atomic():
+            DailyStat.objects.create(date=date, metric=metric, value=delta)
+    except IntegrityError:
+        # Another writer created the row first
+        DailyStat.objects.filter(date=date, metric=metric).update(value=F('value') + delta)
+
+def record_created(prefix, created_at, status):
+    bump(stat_date(created_at), f'{prefix}.{status}', 1)
+
+def record_deleted(prefix, created_at, status):
+    bump(stat_date(created_at), f'{prefix}.{status}', -1)
+
+def record_status_change(prefix, created_at, old_status, new_status):
+    if old_status == new_status:
+        return
+    date = stat_date(created_at)
+    bump(date, f'{prefix}.{old_status}', -1)
+    bump(date, f'{prefix}.{new_status}', 1)
+
+@transaction.atomic
+def update_status_in_bulk(prefix, queryset, new_status, **fields):
+    """queryset.update(status=new_status, ...) that keeps the rollups in step"""
+    moved = defaultdict(int)
+    for created_at, status in queryset.values_list('created_at', 'status'):
+        if status != new_status:
+            moved[(stat_date(created_at), status)] += 1
+
+    # queryset.update() skips auto_now, but delta exports rely on updated_at
+    fields.setdefault('updated_at', timezone.now())
+    updated = queryset.update(status=new_status, **fields)
+
+    for (date, status), count in moved.items():
+        bump(date, f'{prefix}.{status}', -count)
+        bump(date, f'{prefix}.{new_status}', count)
+    if moved:
+        invalidate_status_histogram(queryset.model)
+    return updated
+
+def metric_totals(since=None):
+    """{metric: total} summed over all days, or over days on/after `since`"""
+    DailyStat = global_apps.get_model('accounts', 'DailyStat')
+    stats = DailyStat.objects.all()
+    if since is not None:
+        stats = stats.filter(date__gte=since)
+    return {
+        row['metric']: row['total']
+        for row in stats.values('metric').annotate(total=Sum('value')).order_by()
+    }
+
+def prefix_total(totals, prefix):
+    return sum(value for metric, value in totals.items() if metric.startswith(f'{prefix}.'))
+
+def status_breakdown(totals, prefix, statuses):
+    return {status: totals.get(f'{prefix}.{status}', 0) for status in statuses}
+
+def daily_series(metric, days):
+    """[{'date', 'count'}] for the last `days` days, oldest first, with zero-filled gaps"""
+    DailyStat = global_apps.get_model('accounts', 'DailyStat')
+    today = timezone.localdate()
+    start = today - timedelta(days=days - 1)
+    values = dict(
+        DailyStat.objects.filter(metric=metric, date__gte=start).values_list('date', 'value')
+    )
+    return [
+        {'date': day.isoformat(), 'count': values.get(day, 0)}
+        for day in (start + timedelta(days=offset) for offset in range(days))
+    ]
+
+def rebuild_daily_stats():
+    """Recompute every DailyStat row from the source tables"""
+    DailyStat = global_apps.get_model('accounts', 'DailyStat')
+    counters = defaultdict(int)
+
+    def collect(model, prefix, by_status=True):
+        fields = ['day', 'status'] if by_status else ['day']
+        rows = model.objects.annotate(day=TruncDate('created_at')).values(*fields).annotate(
+            count=Count('id')
+        ).order_by()
+        for row in rows:
+            metric = f"{prefix}.{row['status']}" if by_status else f'{prefix}.new'
+            counters[(row['day'], metric)] += row['count']
+
+    collect(global_apps.get_model('accounts', 'User'), 'users', by_status=False)
+    collect(global_apps.get_model('swaps', 'SwapRequest'), 'swaps')
+    collect(global_apps.get_model('accounts', 'UserReport'), 'user_reports')
+    collect(global_apps.get_model('accounts', 'SkillReport'), 'skill_reports')
+
+    ratings = global_apps.get_model('swaps', 'SwapRating').objects.annotate(day=TruncDate('created_at')).values(
+        'day'
+    ).annotate(count=Count('id'), total=Sum('rating')).order_by()
+    for row in ratings:
+        counters[(row['day'], 'ratings.count')] += row['count']
+        counters[(row['day'], 'ratings.sum')] += row['total'] or 0
+
+    with transaction.atomic():
+        DailyStat.objects.all().delete()
+        DailyStat.objects.bulk_create(
+            [DailyStat(date=day, metric=metric, value=value) for (day, metric), value in counters.items()],
+            batch_size=1000
+        )
+    return len(counters)
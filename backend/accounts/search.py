@@ -0,0 +1,147 @@
+"""
+Search backends for the user directory.
+
+The active backend follows the database: the FTS5 index on SQLite (the only
+database its migration creates the table on) and unindexed icontains
+everywhere else. The USER_SEARCH_BACKEND setting overrides the choice. Every
+backend exposes the same small interface so views only ever call
+search_users() and the index is kept in sync from accounts.signals.
+"""
+import re
+from functools import lru_cache
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q, Case, When, IntegerField
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+SEARCH_FIELDS = ('first_name', 'last_name', 'bio', 'location')
+
+class BaseUserSearchBackend:
+    """
+    Interface every user search backend implements. search() may cut the
+    results off at USER_SEARCH_MAX_RESULTS; capped=False returns every match
+    for callers that page through the results themselves.
+    """
+
+    def search(self, queryset, query, capped=True):
+        raise NotImplementedError
+
+    def index_user(self, user):
+        pass
+
+    def remove_user(self, user_id):
+        pass
+
+    def rebuild(self):
+        return 0
+
+class IContainsSearchBackend(BaseUserSearchBackend):
+    """Unindexed substring search, works on every database"""
+
+    def search(self, queryset, query, capped=True):
+        condition = Q()
+        for field in SEARCH_FIELDS:
+            condition |= Q(**{f'{field}__icontains': query})
+        return queryset.filter(condition)
+
+class SQLiteFTS5SearchBackend(BaseUserSearchBackend):
+    """Ranked prefix search over an FTS5 shadow table keyed by user id"""
+    table = 'accounts_user_fts'
+
+    def __init__(self):
+        self.max_results = getattr(settings, 'USER_SEARCH_MAX_RESULTS', 200)
+
+    @staticmethod
+    def build_match(query):
+        # Quote every token so user input can never inject FTS syntax,
+        # and treat each one as a prefix for search-as-you-type.
+        tokens = re.findall(r'\w+', query)
+        return ' '.join(f'"{token}"*' for token in tokens)
+
+    def create_table(self, cursor):
+        columns = ', '.join(SEARCH_FIELDS)
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5("
+            f"{columns}, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+
+    def search(self, queryset, query, capped=True):
+        match = self.build_match(query)
+        if not match:
+            return queryset.none()
+        if not capped:
+            return self.search_all(queryset, match)
+
+        # Restrict the match to the queryset's users before the LIMIT, so
+        # excluded or inactive users can't take up the max_results slots
+        eligible_sql, eligible_params = queryset.order_by().values('pk').query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s '
+                f'AND rowid IN ({eligible_sql}) ORDER BY rank LIMIT %s',
+                [match, *eligible_params, self.max_results]
+            )
+            user_ids = [row[0] for row in cursor.fetchall()]
+
+        if not user_ids:
+            return queryset.none()
+
+        ranking = Case(
+            *[When(pk=user_id, then=position) for position, user_id in enumerate(user_ids)],
+            output_field=IntegerField()
+        )
+        return queryset.filter(pk__in=user_ids).order_by(ranking)
+
+    def search_all(self, queryset, match):
+        # Every match, ranked in the database instead of through a CASE over
+        # fetched ids, so there is no cap. The rank is looked up by rowid for
+        # each matching row.
+        table = queryset.model._meta.db_table
+        return queryset.filter(
+            pk__in=RawSQL(f'SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s', [match])
+        ).annotate(
+            search_rank=RawSQL(
+                f'SELECT rank FROM {self.table} WHERE {self.table} MATCH %s AND rowid = {table}.id', [match]
+            )
+        ).order_by('search_rank', 'pk')
+
+    def index_user(self, user):
+        columns = ', '.join(SEARCH_FIELDS)
+        placeholders = ', '.join(['%s'] * len(SEARCH_FIELDS))
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [user.pk])
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, {columns}) VALUES (%s, {placeholders})',
+                [user.pk] + [getattr(user, field) or '' for field in SEARCH_FIELDS]
+            )
+
+    def remove_user(self, user_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [user_id])
+
+    def rebuild(self):
+        from .models import User
+
+        columns = ', '.join(SEARCH_FIELDS)
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {self.table}')
+            self.create_table(cursor)
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, {columns}) '
+                f'SELECT id, {columns} FROM {User._meta.db_table}'
+            )
+            return cursor.rowcount
+
+@lru_cache(maxsize=None)
+def get_search_backend():
+    backend_path = getattr(settings, 'USER_SEARCH_BACKEND', None)
+    if backend_path:
+        return import_string(backend_path)()
+    if connection.vendor == 'sqlite':
+        return SQLiteFTS5SearchBackend()
+    return IContainsSearchBackend()
+
+def search_users(queryset, query, capped=True):
+    """Filter a User queryset by a free-text query, ordered by relevance when the backend supports it"""
+    return get_search_backend().search(queryset, query, capped=capped)
@@ -1,9 +1,11 @@
 from rest_framework import serializers
+from django.urls import reverse
 from django.contrib.auth import authenticate, login, logout
-from .models import User, PlatformMessage, UserReport, SkillReport
+from .models import User, PlatformMessage, UserReport, SkillReport, ExportJob
 from skills.models import Skill
 from swaps.models import SwapRequest, SwapSession, SwapRating
-from django.db.models import Count, Avg, Q
+from django.db.models import Count, Avg, Q, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from datetime import datetime, timedelta
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -46,8 +48,8 @@ class UserLoginSerializer(serializers.Serializer):
 
 class UserProfileSerializer(serializers.ModelSerializer):
     full_name = serializers.ReadOnlyField()
-    skills_offered = serializers.SerializerMethodField()
-    skills_wanted = serializers.SerializerMethodField()
+    skills_offered = serializers.ListField(source='skills_offered_summary', child=serializers.CharField(), read_only=True)
+    skills_wanted = serializers.ListField(source='skills_wanted_summary', child=serializers.CharField(), read_only=True)
     
     class Meta:
         model = User
@@ -58,21 +60,11 @@ class UserProfileSerializer(serializers.ModelSerializer):
             'skills_offered', 'skills_wanted', 'is_staff', 'is_superuser'
         )
         read_only_fields = ('id', 'email', 'rating', 'completed_swaps', 'created_at', 'is_staff', 'is_superuser')
-    
-    def get_skills_offered(self, obj):
-        from skills.models import UserSkill
-        skills = UserSkill.objects.filter(user=obj, skill_type='offered')
-        return [skill.skill.name for skill in skills]
-    
-    def get_skills_wanted(self, obj):
-        from skills.models import UserSkill
-        skills = UserSkill.objects.filter(user=obj, skill_type='wanted')
-        return [skill.skill.name for skill in skills]
 
 class UserListSerializer(serializers.ModelSerializer):
     full_name = serializers.ReadOnlyField()
-    skills_offered = serializers.SerializerMethodField()
-    skills_wanted = serializers.SerializerMethodField()
+    skills_offered = serializers.ListField(source='skills_offered_summary', child=serializers.CharField(), read_only=True)
+    skills_wanted = serializers.ListField(source='skills_wanted_summary', child=serializers.CharField(), read_only=True)
     
     class Meta:
         model = User
@@ -80,16 +72,6 @@ class UserListSerializer(serializers.ModelSerializer):
             'id', 'full_name', 'avatar', 'location', 'availability',
             'rating', 'skills_offered', 'skills_wanted', 'bio'
         )
-    
-    def get_skills_offered(self, obj):
-        from skills.models import UserSkill
-        skills = UserSkill.objects.filter(user=obj, skill_type='offered')
-        return [skill.skill.name for skill in skills]
-    
-    def get_skills_wanted(self, obj):
-        from skills.models import UserSkill
-        skills = UserSkill.objects.filter(user=obj, skill_type='wanted')
-        return [skill.skill.name for skill in skills]
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -103,7 +85,8 @@ class UserDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = '__all__'
-        read_only_fields = ['id', 'created_at', 'updated_at', 'rating', 'completed_swaps']
+        read_only_fields = ['id', 'created_at', 'updated_at', 'rating', 'completed_swaps',
+                           'skills_offered_summary', 'skills_wanted_summary']
 
 class PlatformMessageSerializer(serializers.ModelSerializer):
     created_by_name = serializers.CharField(source='created_by.full_name', read_only=True)
@@ -138,8 +121,24 @@ class SkillReportSerializer(serializers.ModelSerializer):
                  'resolved_by', 'resolved_by_name', 'resolved_at', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
 
+def _count_subquery(queryset, field):
+    """COUNT(*) of `queryset` rows whose `field` is the outer user, as a scalar subquery"""
+    counted = queryset.filter(**{field: OuterRef('pk')}).order_by().values(field).annotate(
+        total=Count('pk')
+    ).values('total')
+    return Coalesce(Subquery(counted), 0)
+
+def annotate_admin_counts(queryset):
+    """Add the counts AdminUserSerializer shows, so a page of users costs one query"""
+    return queryset.annotate(
+        total_swaps=_count_subquery(SwapRequest.objects.all(), 'from_user') +
+                    _count_subquery(SwapRequest.objects.all(), 'to_user'),
+        total_reports_received=_count_subquery(UserReport.objects.all(), 'reported_user'),
+        total_reports_made=_count_subquery(UserReport.objects.all(), 'reporter'),
+    )
+
 class AdminUserSerializer(serializers.ModelSerializer):
-    """Serializer for admin user management"""
+    """Serializer for admin user management; use annotate_admin_counts() on list querysets"""
     total_swaps = serializers.SerializerMethodField()
     total_reports_received = serializers.SerializerMethodField()
     total_reports_made = serializers.SerializerMethodField()
@@ -152,14 +151,20 @@ class AdminUserSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'rating', 'completed_swaps']
     
     def get_total_swaps(self, obj):
+        if hasattr(obj, 'total_swaps'):
+            return obj.total_swaps
         return SwapRequest.objects.filter(
             Q(from_user=obj) | Q(to_user=obj)
         ).count()
     
     def get_total_reports_received(self, obj):
+        if hasattr(obj, 'total_reports_received'):
+            return obj.total_reports_received
         return UserReport.objects.filter(reported_user=obj).count()
     
     def get_total_reports_made(self, obj):
+        if hasattr(obj, 'total_reports_made'):
+            return obj.total_reports_made
         return UserReport.objects.filter(reporter=obj).count()
 
 class AdminDashboardSerializer(serializers.Serializer):
@@ -219,3 +224,20 @@ class UserActivityReportSerializer(serializers.Serializer):
     reports_made = serializers.IntegerField()
     is_banned = serializers.BooleanField()
     ban_reason = serializers.CharField(allow_blank=True)
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    """Status of a background report export"""
+    requested_by_name = serializers.CharField(source='requested_by.full_name', read_only=True)
+    download_url = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = ExportJob
+        fields = ['id', 'export_type', 'status', 'requested_by', 'requested_by_name',
+                 'rows_written', 'file_size', 'error', 'download_url', 'created_at',
+                 'started_at', 'finished_at', 'expires_at']
+        read_only_fields = fields
+    
+    def get_download_url(self, obj):
+        if obj.status != 'completed':
+            return None
+        return reverse('export_job_download', kwargs={'pk': obj.pk})
@@ -0,0 +1,109 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from swaps.models import SwapRequest, SwapRating
+from . import rollups
+from .histograms import invalidate_status_histogram
+from .models import User, UserReport, SkillReport
+from .search import SEARCH_FIELDS, get_search_backend
+
+@receiver(post_save, sender=User)
+def index_user_for_search(sender, instance, update_fields=None, **kwargs):
+    # Saves such as last_login updates don't touch any searchable column
+    if update_fields is not None and not set(update_fields) & set(SEARCH_FIELDS):
+        return
+    get_search_backend().index_user(instance)
+
+@receiver(post_delete, sender=User)
+def remove_user_from_search(sender, instance, **kwargs):
+    get_search_backend().remove_user(instance.pk)
+
+# Daily statistics rollups (see accounts/rollups.py)
+
+ROLLUP_PREFIXES = {
+    SwapRequest: 'swaps',
+    UserReport: 'user_reports',
+    SkillReport: 'skill_reports',
+}
+
+@receiver(post_save, sender=User)
+def count_new_user(sender, instance, created, **kwargs):
+    if created:
+        rollups.bump(rollups.stat_date(instance.created_at), 'users.new', 1)
+
+@receiver(post_delete, sender=User)
+def uncount_user(sender, instance, **kwargs):
+    rollups.bump(rollups.stat_date(instance.created_at), 'users.new', -1)
+
+def stored_value(sender, instance, field, update_fields):
+    """
+    The value of `field` in the row `instance` is about to overwrite, or None
+    for a new row. Read in pre_save rather than remembered when the instance
+    is loaded, so streamed or .only() querysets don't pay for it.
+    """
+    if instance.pk is None:
+        return None
+    if update_fields is not None and field not in update_fields:
+        # The save leaves the column alone
+        return getattr(instance, field)
+    return sender.objects.filter(pk=instance.pk).values_list(field, flat=True).first()
+
+def remember_status(sender, instance, update_fields=None, **kwargs):
+    instance._rollup_status = stored_value(sender, instance, 'status', update_fields)
+
+def count_status(sender, instance, created, **kwargs):
+    prefix = ROLLUP_PREFIXES[sender]
+    if created:
+        rollups.record_created(prefix, instance.created_at, instance.status)
+    else:
+        rollups.record_status_change(prefix, instance.created_at, instance._rollup_status, instance.status)
+    if created or instance._rollup_status != instance.status:
+        invalidate_status_histogram(sender)
+
+def uncount_status(sender, instance, **kwargs):
+    rollups.record_deleted(ROLLUP_PREFIXES[sender], instance.created_at, instance.status)
+    invalidate_status_histogram(sender)
+
+for model in ROLLUP_PREFIXES:
+    pre_save.connect(remember_status, sender=model, dispatch_uid=f'rollup_pre_save_{model.__name__}')
+    post_save.connect(count_status, sender=model, dispatch_uid=f'rollup_save_{model.__name__}')
+    post_delete.connect(uncount_status, sender=model, dispatch_uid=f'rollup_delete_{model.__name__}')
+
+@receiver(pre_save, sender=SwapRating)
+def remember_rating(sender, instance, update_fields=None, **kwargs):
+    instance._rollup_rating = stored_value(sender, instance, 'rating', update_fields)
+
+@receiver(post_save, sender=SwapRating)
+def count_rating(sender, instance, created, **kwargs):
+    date = rollups.stat_date(instance.created_at)
+    if created:
+        rollups.bump(date, 'ratings.count', 1)
+        rollups.bump(date, 'ratings.sum', instance.rating)
+    else:
+        rollups.bump(date, 'ratings.sum', instance.rating - instance._rollup_rating)
+
+@receiver(post_delete, sender=SwapRating)
+def uncount_rating(sender, instance, **kwargs):
+    date = rollups.stat_date(instance.created_at)
+    rollups.bump(date, 'ratings.count', -1)
+    rollups.bump(date, 'ratings.sum', -instance.rating)
+
+# Delta exports (see accounts/exports.py changed_users)
+
+def touch_users(*user_ids):
+    User.objects.filter(pk__in=user_ids).update(updated_at=timezone.now())
+
+@receiver(post_delete, sender=SwapRequest)
+def swap_deleted(sender, instance, **kwargs):
+    # The swap row is gone, so mark both users changed instead
+    touch_users(instance.from_user_id, instance.to_user_id)
+
+@receiver(post_delete, sender=UserReport)
+def user_report_deleted(sender, instance, **kwargs):
+    touch_users(instance.reporter_id, instance.reported_user_id)
+
+@receiver(post_save, sender=SwapRating)
+@receiver(post_delete, sender=SwapRating)
+def rating_changed(sender, instance, **kwargs):
+    # Ratings have no updated_at; moving the swap's marks both of its users
+    SwapRequest.objects.filter(swapsession=instance.swap_session_id).update(updated_at=timezone.now())
@@ -0,0 +1,129 @@
+"""
+Calendar-aligned time series for the admin analytics.
+
+Each series is one grouped query over Trunc(<timestamp>, granularity) in the
+current time zone. Empty buckets are filled with zeros, so the result always
+has one entry per calendar day, ISO week (starting Monday) or month in the
+requested range. Results are cached per (metric, granularity, range) for
+TIME_SERIES_TIMEOUT seconds.
+"""
+from datetime import date, datetime, time, timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Count, DateField
+from django.db.models.functions import Trunc
+from django.utils import timezone
+from swaps.models import SwapRequest, SwapRating
+from .models import User, UserReport, SkillReport
+
+GRANULARITIES = ('day', 'week', 'month')
+
+MAX_BUCKETS = 1000
+
+# metric: (model, timestamp field, breakdown by status)
+SERIES = {
+    'users': (User, 'created_at', False),
+    'swaps': (SwapRequest, 'created_at', True),
+    'user_reports': (UserReport, 'created_at', True),
+    'skill_reports': (SkillReport, 'created_at', True),
+    'ratings': (SwapRating, 'created_at', False),
+}
+
+def bucket_start(day, granularity):
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'month':
+        return day.replace(day=1)
+    return day
+
+def next_bucket(day, granularity):
+    if granularity == 'week':
+        return day + timedelta(days=7)
+    if granularity == 'month':
+        return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return day + timedelta(days=1)
+
+def buckets(start, end, granularity):
+    """Every bucket start from the bucket containing `start` to the one containing `end`"""
+    day = bucket_start(start, granularity)
+    while day <= end:
+        yield day
+        day = next_bucket(day, granularity)
+
+def default_range(granularity, periods=12, today=None):
+    """The last `periods` buckets (30 for days), ending with the current one"""
+    today = today or timezone.localdate()
+    if granularity == 'day':
+        return today - timedelta(days=29), today
+    start = bucket_start(today, granularity)
+    for _ in range(periods - 1):
+        start = bucket_start(start - timedelta(days=1), granularity)
+    return start, today
+
+def _local_midnight(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+def time_series(metric, granularity, start, end):
+    """
+    [{'period': 'YYYY-MM-DD', 'count': n, ...}] for each bucket between the
+    dates `start` and `end` (inclusive), oldest first. Status-tracked metrics
+    add 'by_status'; ratings add 'average'.
+    """
+    if metric not in SERIES:
+        raise ValueError(f'Unknown metric "{metric}". Choose from: {", ".join(SERIES)}')
+    if granularity not in GRANULARITIES:
+        raise ValueError(f'Unknown granularity "{granularity}". Choose from: {", ".join(GRANULARITIES)}')
+    if start > end:
+        raise ValueError('start must not be after end')
+
+    periods = []
+    for day in buckets(start, end, granularity):
+        periods.append(day)
+        if len(periods) > MAX_BUCKETS:
+            raise ValueError(f'Range too large: more than {MAX_BUCKETS} {granularity} buckets')
+
+    key = f'time_series:{metric}:{granularity}:{start.isoformat()}:{end.isoformat()}'
+    series = cache.get(key)
+    if series is None:
+        series = _compute(metric, granularity, periods)
+        cache.set(key, series, getattr(settings, 'TIME_SERIES_TIMEOUT', 300))
+    return series
+
+def _compute(metric, granularity, periods):
+    model, field, by_status = SERIES[metric]
+    rows = model.objects.filter(**{
+        f'{field}__gte': _local_midnight(periods[0]),
+        f'{field}__lt': _local_midnight(next_bucket(periods[-1], granularity)),
+    }).annotate(
+        period=Trunc(field, granularity, output_field=DateField())
+    ).order_by()
+
+    entries = {day: {'period': day.isoformat(), 'count': 0} for day in periods}
+    if by_status:
+        statuses = [value for value, _ in model._meta.get_field('status').choices]
+        for entry in entries.values():
+            entry['by_status'] = dict.fromkeys(statuses, 0)
+        for row in rows.values('period', 'status').annotate(count=Count('id')):
+            entry = entries[row['period']]
+            entry['count'] += row['count']
+            entry['by_status'][row['status']] = row['count']
+    elif metric == 'ratings':
+        for entry in entries.values():
+            entry['average'] = None
+        for row in rows.values('period').annotate(count=Count('id'), average=Avg('rating')):
+            entries[row['period']].update(count=row['count'], average=round(row['average'], 2))
+    else:
+        for row in rows.values('period').annotate(count=Count('id')):
+            entries[row['period']]['count'] = row['count']
+
+    return [entries[day] for day in periods]
+
+def parse_range(start, end, granularity):
+    """Dates from ?start=/?end= strings (YYYY-MM-DD), defaulting per granularity"""
+    default_start, default_end = default_range(granularity)
+    try:
+        start = date.fromisoformat(start) if start else default_start
+        end = date.fromisoformat(end) if end else default_end
+    except ValueError:
+        raise ValueError('start and end must be dates in YYYY-MM-DD format')
+    return start, end
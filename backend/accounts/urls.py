@@ -31,6 +31,8 @@ urlpatterns = [
     
     # Statistics and Reports
     path('admin/stats/swaps/', views.SwapStatsView.as_view(), name='admin_swap_stats'),
+    path('admin/stats/timeseries/', views.AdminTimeSeriesView.as_view(), name='admin_time_series'),
+    path('admin/stats/skill-pairs/', views.AdminSkillPairStatsView.as_view(), name='admin_skill_pair_stats'),
     path('admin/reports/download/users/', views.DownloadUserActivityReportView.as_view(), name='download_user_report'),
     path('admin/reports/download/swaps/', views.DownloadSwapReportView.as_view(), name='download_swap_report'),
     path('admin/reports/download/logs/', views.DownloadReportLogView.as_view(), name='download_report_logs'),
@@ -40,4 +42,9 @@ urlpatterns = [
     path('admin/swaps/', views.AdminSwapMonitoringView.as_view(), name='admin_swaps'),
     path('admin/reports/enhanced/', views.AdminEnhancedReportsView.as_view(), name='admin_enhanced_reports'),
     path('admin/reports/download/enhanced/', views.DownloadEnhancedReportView.as_view(), name='download_enhanced_reports'),
+    
+    # Background exports
+    path('admin/exports/', views.ExportJobListCreateView.as_view(), name='export_jobs'),
+    path('admin/exports/<int:pk>/', views.ExportJobDetailView.as_view(), name='export_job_detail'),
+    path('admin/exports/<int:pk>/download/', views.ExportJobDownloadView.as_view(), name='export_job_download'),
 ]
@@ -2,17 +2,31 @@ from rest_framework import status, generics, permissions
 from rest_framework.decorators import api_view, permission_classes, parser_classes
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.exceptions import ValidationError
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.hashers import make_password
-from django.db.models import Count, Avg, Q
+from django.db.models import Count, Avg, Q, F, Func, OuterRef, Subquery
 from django.utils import timezone
 from datetime import datetime, timedelta
-import csv
-from django.http import HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.db import models
-from .models import User, PlatformMessage, UserReport, SkillReport
+from django.conf import settings
+from .models import User, PlatformMessage, UserReport, SkillReport, ExportJob
+from .search import search_users
+from .moderation import moderation_events
+from .histograms import status_histogram
+from .timeseries import time_series, default_range, parse_range
+from .rollups import (
+    metric_totals, prefix_total, status_breakdown, daily_series, update_status_in_bulk
+)
+from .exports import (
+    stream_export, export_format, SWAP_REPORT_HEADER, swap_report_rows, REPORT_LOG_HEADER, report_log_rows,
+    USER_ACTIVITY_HEADER, ENHANCED_USER_ACTIVITY_HEADER, user_activity_rows, SWAP_ANALYTICS_HEADER,
+    swap_analytics_rows, MODERATION_LOG_HEADER, moderation_log_rows, EXPORTS, ranged_file_response,
+    export_since, parse_time_param, full_name
+)
 from .serializers import (
     UserRegistrationSerializer, 
     UserLoginSerializer, 
@@ -20,11 +34,16 @@ from .serializers import (
     UserListSerializer,
     UserSerializer, UserDetailSerializer, PlatformMessageSerializer,
     UserReportSerializer, SkillReportSerializer, AdminUserSerializer,
-    AdminDashboardSerializer, SwapStatsSerializer, UserActivityReportSerializer
+    AdminDashboardSerializer, SwapStatsSerializer, UserActivityReportSerializer,
+    ExportJobSerializer, annotate_admin_counts
 )
 from django.views.decorators.csrf import ensure_csrf_cookie
 from skills.models import Skill, UserSkill
 from swaps.models import SwapRequest, SwapSession, SwapRating
+from swaps.transitions import transition_swap, InvalidTransition
+from swaps.analytics import skill_success_rates
+from swaps.pairs import top_pairs, best_converting_pairs, category_flows
+from skillswap.pagination import KeysetPagination, OptionalKeysetPaginationMixin, wants_keyset_pagination
 
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
@@ -159,18 +178,13 @@ class UserListView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        queryset = User.objects.exclude(id=self.request.user.id).filter(is_active=True)
+        queryset = User.objects.exclude(id=self.request.user.id).filter(is_active=True).order_by('-created_at')
         search = self.request.query_params.get('search', None)
         
         if search:
-            queryset = queryset.filter(
-                models.Q(first_name__icontains=search) |
-                models.Q(last_name__icontains=search) |
-                models.Q(bio__icontains=search) |
-                models.Q(location__icontains=search)
-            )
+            queryset = search_users(queryset, search)
         
-        return queryset.order_by('-created_at')
+        return queryset
 
 class UserDetailView(generics.RetrieveAPIView):
     """Get detailed user information"""
@@ -189,18 +203,13 @@ def csrf(request):
 @permission_classes([permissions.IsAuthenticated])
 def user_list(request):
     """List all users with search functionality"""
-    queryset = User.objects.exclude(id=request.user.id).filter(is_active=True)
+    queryset = User.objects.exclude(id=request.user.id).filter(is_active=True).order_by('-created_at')
     search = request.query_params.get('search', None)
     
     if search:
-        queryset = queryset.filter(
-            models.Q(first_name__icontains=search) |
-            models.Q(last_name__icontains=search) |
-            models.Q(bio__icontains=search) |
-            models.Q(location__icontains=search)
-        )
+        queryset = search_users(queryset, search)
     
-    serializer = UserListSerializer(queryset.order_by('-created_at'), many=True)
+    serializer = UserListSerializer(queryset, many=True)
     return Response(serializer.data)
 
 @api_view(['GET'])
@@ -230,13 +239,14 @@ class AdminDashboardView(generics.GenericAPIView):
     permission_classes = [IsAdminUser]
     
     def get(self, request):
-        # Basic statistics
-        total_users = User.objects.count()
-        total_swaps = SwapRequest.objects.count()
-        total_reports = UserReport.objects.count()
-        total_skill_reports = SkillReport.objects.count()
-        pending_reports = UserReport.objects.filter(status='pending').count()
-        pending_skill_reports = SkillReport.objects.filter(status='pending').count()
+        # Basic statistics (from the daily rollups, see accounts/rollups.py)
+        totals = metric_totals()
+        total_users = totals.get('users.new', 0)
+        total_swaps = prefix_total(totals, 'swaps')
+        total_reports = prefix_total(totals, 'user_reports')
+        total_skill_reports = prefix_total(totals, 'skill_reports')
+        pending_reports = totals.get('user_reports.pending', 0)
+        pending_skill_reports = totals.get('skill_reports.pending', 0)
         banned_users = User.objects.filter(is_banned=True).count()
         active_messages = PlatformMessage.objects.filter(is_active=True).count()
         
@@ -254,29 +264,17 @@ class AdminDashboardView(generics.GenericAPIView):
         )
         
         # User growth data (last 30 days)
-        user_growth = []
-        for i in range(30):
-            date = timezone.now() - timedelta(days=i)
-            count = User.objects.filter(created_at__date=date.date()).count()
-            user_growth.append({'date': date.date().isoformat(), 'count': count})
-        user_growth.reverse()
+        user_growth = daily_series('users.new', 30)
         
         # Swap statistics
-        swap_stats = {
-            'pending': SwapRequest.objects.filter(status='pending').count(),
-            'accepted': SwapRequest.objects.filter(status='accepted').count(),
-            'completed': SwapRequest.objects.filter(status='completed').count(),
-            'cancelled': SwapRequest.objects.filter(status='cancelled').count(),
-            'rejected': SwapRequest.objects.filter(status='rejected').count(),
-        }
+        swap_stats = status_breakdown(
+            totals, 'swaps', ['pending', 'accepted', 'completed', 'cancelled', 'rejected']
+        )
         
         # Report statistics
-        report_stats = {
-            'pending': UserReport.objects.filter(status='pending').count(),
-            'investigating': UserReport.objects.filter(status='investigating').count(),
-            'resolved': UserReport.objects.filter(status='resolved').count(),
-            'dismissed': UserReport.objects.filter(status='dismissed').count(),
-        }
+        report_stats = status_breakdown(
+            totals, 'user_reports', ['pending', 'investigating', 'resolved', 'dismissed']
+        )
         
         data = {
             'total_users': total_users,
@@ -298,11 +296,45 @@ class AdminDashboardView(generics.GenericAPIView):
         serializer = AdminDashboardSerializer(data)
         return Response(serializer.data)
 
-class AdminUserListView(generics.ListAPIView):
-    """List all users for admin management"""
+class AdminUserListView(OptionalKeysetPaginationMixin, generics.ListAPIView):
+    """
+    List all users for admin management.
+    Filters: ?is_banned=true|false, ?joined_after= / ?joined_before= (dates,
+    before is exclusive) and ?search=. Search returns every match by
+    relevance and only works with page-number pagination.
+    """
     permission_classes = [IsAdminUser]
     serializer_class = AdminUserSerializer
-    queryset = User.objects.all().order_by('-created_at')
+    
+    def get_queryset(self):
+        queryset = User.objects.all()
+        params = self.request.query_params
+        
+        is_banned = params.get('is_banned')
+        if is_banned in ('true', 'false'):
+            queryset = queryset.filter(is_banned=is_banned == 'true')
+        
+        try:
+            joined_after = parse_time_param(self.request, 'joined_after')
+            joined_before = parse_time_param(self.request, 'joined_before')
+        except ValueError as e:
+            raise ValidationError({'error': str(e)})
+        if joined_after:
+            queryset = queryset.filter(created_at__gte=joined_after)
+        if joined_before:
+            queryset = queryset.filter(created_at__lt=joined_before)
+        
+        queryset = queryset.order_by('-created_at')
+        search = params.get('search')
+        if search:
+            # Results come back in relevance order, which a created_at
+            # cursor can't page through
+            if wants_keyset_pagination(self.request):
+                raise ValidationError({'error': '?search= cannot be combined with ?pagination=cursor'})
+            # Admins page through every match rather than the capped top hits
+            queryset = search_users(queryset, search, capped=False)
+        
+        return annotate_admin_counts(queryset)
 
 class AdminUserDetailView(generics.RetrieveUpdateAPIView):
     """Get and update user details for admin"""
@@ -354,7 +386,7 @@ class PlatformMessageDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = PlatformMessageSerializer
     queryset = PlatformMessage.objects.all()
 
-class UserReportListView(generics.ListAPIView):
+class UserReportListView(OptionalKeysetPaginationMixin, generics.ListAPIView):
     """List user reports for admin review"""
     permission_classes = [IsAdminUser]
     serializer_class = UserReportSerializer
@@ -372,7 +404,7 @@ class UserReportDetailView(generics.RetrieveUpdateAPIView):
         else:
             serializer.save()
 
-class SkillReportListView(generics.ListAPIView):
+class SkillReportListView(OptionalKeysetPaginationMixin, generics.ListAPIView):
     """List skill reports for admin review"""
     permission_classes = [IsAdminUser]
     serializer_class = SkillReportSerializer
@@ -395,26 +427,24 @@ class SwapStatsView(generics.GenericAPIView):
     permission_classes = [IsAdminUser]
     
     def get(self, request):
-        # Basic stats
-        total_swaps = SwapRequest.objects.count()
-        pending_swaps = SwapRequest.objects.filter(status='pending').count()
-        accepted_swaps = SwapRequest.objects.filter(status='accepted').count()
-        completed_swaps = SwapRequest.objects.filter(status='completed').count()
-        cancelled_swaps = SwapRequest.objects.filter(status='cancelled').count()
-        rejected_swaps = SwapRequest.objects.filter(status='rejected').count()
-        
-        # Time-based stats
-        now = timezone.now()
-        week_ago = now - timedelta(days=7)
-        month_ago = now - timedelta(days=30)
-        year_ago = now - timedelta(days=365)
-        
-        swaps_this_week = SwapRequest.objects.filter(created_at__gte=week_ago).count()
-        swaps_this_month = SwapRequest.objects.filter(created_at__gte=month_ago).count()
-        swaps_this_year = SwapRequest.objects.filter(created_at__gte=year_ago).count()
+        # Basic stats (from the daily rollups, see accounts/rollups.py)
+        totals = metric_totals()
+        total_swaps = prefix_total(totals, 'swaps')
+        pending_swaps = totals.get('swaps.pending', 0)
+        accepted_swaps = totals.get('swaps.accepted', 0)
+        completed_swaps = totals.get('swaps.completed', 0)
+        cancelled_swaps = totals.get('swaps.cancelled', 0)
+        rejected_swaps = totals.get('swaps.rejected', 0)
+        
+        # Time-based stats (whole days)
+        today = timezone.localdate()
+        swaps_this_week = prefix_total(metric_totals(since=today - timedelta(days=6)), 'swaps')
+        swaps_this_month = prefix_total(metric_totals(since=today - timedelta(days=29)), 'swaps')
+        swaps_this_year = prefix_total(metric_totals(since=today - timedelta(days=364)), 'swaps')
         
         # Average rating
-        average_rating = SwapRating.objects.aggregate(avg_rating=Avg('rating'))['avg_rating'] or 0.0
+        rating_count = totals.get('ratings.count', 0)
+        average_rating = totals.get('ratings.sum', 0) / rating_count if rating_count else 0.0
         
         # Top skills
         top_offered_skills = Skill.objects.filter(
@@ -447,116 +477,101 @@ class SwapStatsView(generics.GenericAPIView):
         serializer = SwapStatsSerializer(data)
         return Response(serializer.data)
 
-class DownloadUserActivityReportView(generics.GenericAPIView):
-    """Download user activity report as CSV"""
+class AdminTimeSeriesView(generics.GenericAPIView):
+    """
+    Time series for the admin analytics.
+    ?metric=users|swaps|user_reports|skill_reports|ratings
+    ?granularity=day|week|month  ?start=YYYY-MM-DD  ?end=YYYY-MM-DD
+    """
     permission_classes = [IsAdminUser]
     
     def get(self, request):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="user_activity_report.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow([
-            'User ID', 'Username', 'Email', 'Full Name', 'Join Date', 'Last Login',
-            'Total Swaps', 'Completed Swaps', 'Average Rating', 'Reports Received',
-            'Reports Made', 'Is Banned', 'Ban Reason'
-        ])
+        metric = request.query_params.get('metric', 'users')
+        granularity = request.query_params.get('granularity', 'day')
         
-        users = User.objects.all()
-        for user in users:
-            total_swaps = SwapRequest.objects.filter(
-                Q(from_user=user) | Q(to_user=user)
-            ).count()
-            
-            completed_swaps = SwapRequest.objects.filter(
-                Q(from_user=user) | Q(to_user=user),
-                status='completed'
-            ).count()
-            
-            # Calculate average rating from swap ratings
-            user_ratings = SwapRating.objects.filter(
-                swap_session__swap_request__from_user=user
-            ).aggregate(avg_rating=Avg('rating'))['avg_rating'] or 0.0
-            
-            reports_received = UserReport.objects.filter(reported_user=user).count()
-            reports_made = UserReport.objects.filter(reporter=user).count()
-            
-            writer.writerow([
-                user.id, user.username, user.email, user.full_name,
-                user.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-                user.last_login.strftime('%Y-%m-%d %H:%M:%S') if user.last_login else 'Never',
-                total_swaps, completed_swaps, round(user_ratings, 2),
-                reports_received, reports_made, user.is_banned, user.ban_reason or ''
-            ])
+        try:
+            start, end = parse_range(
+                request.query_params.get('start'), request.query_params.get('end'), granularity
+            )
+            series = time_series(metric, granularity, start, end)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
-        return response
+        return Response({
+            'metric': metric,
+            'granularity': granularity,
+            'start': start,
+            'end': end,
+            'series': series
+        })
 
-class DownloadSwapReportView(generics.GenericAPIView):
-    """Download swap activity report as CSV"""
+class AdminSkillPairStatsView(generics.GenericAPIView):
+    """
+    Most requested (offered, wanted) skill pairs, the pairs that convert best
+    to completed swaps, and category-to-category flows.
+    ?limit= caps the pair lists (max 100); ?min_swaps= is the floor for conversion.
+    """
     permission_classes = [IsAdminUser]
     
     def get(self, request):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="swap_activity_report.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow([
-            'Swap ID', 'From User', 'To User', 'Skill Offered', 'Skill Wanted',
-            'Status', 'Duration', 'Preferred Time', 'Created At', 'Updated At'
-        ])
-        
-        swaps = SwapRequest.objects.all().select_related('from_user', 'to_user', 'skill_offered', 'skill_wanted')
-        for swap in swaps:
-            writer.writerow([
-                swap.id, swap.from_user.full_name, swap.to_user.full_name,
-                swap.skill_offered.name, swap.skill_wanted.name, swap.status,
-                swap.duration, swap.preferred_time,
-                swap.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-                swap.updated_at.strftime('%Y-%m-%d %H:%M:%S')
-            ])
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+            min_swaps = max(int(request.query_params.get('min_swaps', 5)), 1)
+        except ValueError:
+            return Response({'error': 'limit and min_swaps must be integers'}, status=status.HTTP_400_BAD_REQUEST)
         
-        return response
+        return Response({
+            'top_pairs': top_pairs(limit),
+            'best_converting_pairs': best_converting_pairs(limit, min_swaps),
+            'category_flows': category_flows()
+        })
 
-class DownloadReportLogView(generics.GenericAPIView):
-    """Download report logs as CSV"""
+class ExportContentNegotiation(DefaultContentNegotiation):
+    """Leave ?format= to the export (csv, csv.gz, ndjson, ndjson.gz); errors still render as JSON"""
+    
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+class ReportDownloadView(generics.GenericAPIView):
+    """Base for the report downloads: admin only, ?format= picks the export format"""
     permission_classes = [IsAdminUser]
+    content_negotiation_class = ExportContentNegotiation
+    
+    def stream_report(self, request, filename, header, rows, delta=False, time_range=False, **kwargs):
+        """
+        Stream rows(**kwargs). With `delta`, limited to rows changed after
+        ?since=; with `time_range`, to events between ?since= and ?until=.
+        """
+        try:
+            fmt = export_format(request)
+            if delta:
+                kwargs['since'] = export_since(request)
+            if time_range:
+                kwargs['since'] = parse_time_param(request, 'since')
+                kwargs['until'] = parse_time_param(request, 'until')
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        watermark = timezone.now() if delta else None
+        return stream_export(filename, header, rows(**kwargs), fmt, watermark=watermark)
+
+class DownloadUserActivityReportView(ReportDownloadView):
+    """Download user activity report; ?since= limits it to users whose activity changed"""
     
     def get(self, request):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="report_logs.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow([
-            'Report ID', 'Type', 'Reporter', 'Reported User/Skill', 'Report Type',
-            'Description', 'Status', 'Admin Notes', 'Resolved By', 'Resolved At',
-            'Created At'
-        ])
-        
-        # User reports
-        user_reports = UserReport.objects.all().select_related('reporter', 'reported_user', 'resolved_by')
-        for report in user_reports:
-            writer.writerow([
-                f'UR-{report.id}', 'User Report', report.reporter.full_name,
-                report.reported_user.full_name, report.report_type,
-                report.description[:100], report.status, report.admin_notes[:100],
-                report.resolved_by.full_name if report.resolved_by else '',
-                report.resolved_at.strftime('%Y-%m-%d %H:%M:%S') if report.resolved_at else '',
-                report.created_at.strftime('%Y-%m-%d %H:%M:%S')
-            ])
-        
-        # Skill reports
-        skill_reports = SkillReport.objects.all().select_related('reporter', 'skill', 'resolved_by')
-        for report in skill_reports:
-            writer.writerow([
-                f'SR-{report.id}', 'Skill Report', report.reporter.full_name,
-                report.skill.name, report.report_type,
-                report.description[:100], report.status, report.admin_notes[:100],
-                report.resolved_by.full_name if report.resolved_by else '',
-                report.resolved_at.strftime('%Y-%m-%d %H:%M:%S') if report.resolved_at else '',
-                report.created_at.strftime('%Y-%m-%d %H:%M:%S')
-            ])
-        
-        return response
+        return self.stream_report(request, 'user_activity_report', USER_ACTIVITY_HEADER, user_activity_rows, delta=True)
+
+class DownloadSwapReportView(ReportDownloadView):
+    """Download swap activity report; ?since= limits it to swaps updated after that time"""
+    
+    def get(self, request):
+        return self.stream_report(request, 'swap_activity_report', SWAP_REPORT_HEADER, swap_report_rows, delta=True)
+
+class DownloadReportLogView(ReportDownloadView):
+    """Download report logs; ?since= limits it to reports updated after that time"""
+    
+    def get(self, request):
+        return self.stream_report(request, 'report_logs', REPORT_LOG_HEADER, report_log_rows, delta=True)
 
 class AdminSkillManagementView(generics.GenericAPIView):
     """Admin view for managing skills and rejecting inappropriate descriptions"""
@@ -628,11 +643,10 @@ class AdminSkillManagementView(generics.GenericAPIView):
             
             if action == 'reject':
                 # Mark all pending reports as resolved
-                SkillReport.objects.filter(
-                    skill=skill, 
-                    status='pending'
-                ).update(
-                    status='skill_removed',
+                update_status_in_bulk(
+                    'skill_reports',
+                    SkillReport.objects.filter(skill=skill, status='pending'),
+                    'skill_removed',
                     admin_notes=f"Skill rejected: {reason}",
                     resolved_by=request.user,
                     resolved_at=timezone.now()
@@ -649,11 +663,10 @@ class AdminSkillManagementView(generics.GenericAPIView):
             
             elif action == 'approve':
                 # Mark all pending reports as resolved
-                SkillReport.objects.filter(
-                    skill=skill, 
-                    status='pending'
-                ).update(
-                    status='approved',
+                update_status_in_bulk(
+                    'skill_reports',
+                    SkillReport.objects.filter(skill=skill, status='pending'),
+                    'approved',
                     admin_notes=f"Skill approved: {reason}",
                     resolved_by=request.user,
                     resolved_at=timezone.now()
@@ -693,20 +706,30 @@ class AdminSwapMonitoringView(generics.GenericAPIView):
         if status_filter:
             swaps = swaps.filter(status=status_filter)
         
-        # Pagination
-        start = (page - 1) * page_size
-        end = start + page_size
-        paginated_swaps = swaps[start:end]
+        # Swap statistics: every status and the total in one cached grouped query
+        filters = {'status': status_filter} if status_filter else {}
+        status_counts, total_swaps = status_histogram(SwapRequest, **filters)
         
-        # Get swap statistics
-        total_swaps = swaps.count()
-        status_counts = {
-            'pending': swaps.filter(status='pending').count(),
-            'accepted': swaps.filter(status='accepted').count(),
-            'completed': swaps.filter(status='completed').count(),
-            'cancelled': swaps.filter(status='cancelled').count(),
-            'rejected': swaps.filter(status='rejected').count(),
-        }
+        # Pagination
+        if wants_keyset_pagination(request):
+            paginator = KeysetPagination()
+            paginated_swaps = paginator.paginate_queryset(swaps, request, view=self)
+            pagination = {
+                'page_size': paginator.get_page_size(request),
+                'next': paginator.get_next_link(),
+                'previous': paginator.get_previous_link()
+            }
+        else:
+            start = (page - 1) * page_size
+            end = start + page_size
+            paginated_swaps = swaps[start:end]
+            
+            pagination = {
+                'page': page,
+                'page_size': page_size,
+                'total': total_swaps,
+                'total_pages': (total_swaps + page_size - 1) // page_size
+            }
         
         data = {
             'swaps': [
@@ -733,12 +756,7 @@ class AdminSwapMonitoringView(generics.GenericAPIView):
                 }
                 for swap in paginated_swaps
             ],
-            'pagination': {
-                'page': page,
-                'page_size': page_size,
-                'total': total_swaps,
-                'total_pages': (total_swaps + page_size - 1) // page_size
-            },
+            'pagination': pagination,
             'statistics': status_counts
         }
         
@@ -754,28 +772,27 @@ class AdminSwapMonitoringView(generics.GenericAPIView):
             swap = SwapRequest.objects.get(id=swap_id)
             
             if action == 'cancel':
-                if swap.status in ['pending', 'accepted']:
-                    swap.status = 'cancelled'
-                    swap.save()
-                    
-                    # Create a platform message to notify users
-                    PlatformMessage.objects.create(
-                        title=f"Swap Cancelled by Admin",
-                        content=f"Your swap (ID: {swap.id}) has been cancelled by an administrator. Reason: {reason}",
-                        message_type='notification',
-                        created_by=request.user,
-                        is_active=True
-                    )
-                    
-                    return Response({
-                        'message': f'Swap {swap.id} cancelled successfully',
-                        'reason': reason
-                    })
-                else:
+                try:
+                    transition_swap(swap, 'cancelled')
+                except InvalidTransition:
                     return Response(
                         {'error': 'Cannot cancel swap in current status'}, 
                         status=status.HTTP_400_BAD_REQUEST
                     )
+                
+                # Create a platform message to notify users
+                PlatformMessage.objects.create(
+                    title=f"Swap Cancelled by Admin",
+                    content=f"Your swap (ID: {swap.id}) has been cancelled by an administrator. Reason: {reason}",
+                    message_type='notification',
+                    created_by=request.user,
+                    is_active=True
+                )
+                
+                return Response({
+                    'message': f'Swap {swap.id} cancelled successfully',
+                    'reason': reason
+                })
             
             elif action == 'modify':
                 # Allow admin to modify swap details
@@ -783,14 +800,22 @@ class AdminSwapMonitoringView(generics.GenericAPIView):
                 new_duration = request.data.get('new_duration')
                 new_preferred_time = request.data.get('new_preferred_time')
                 
-                if new_status:
-                    swap.status = new_status
+                if new_status and new_status != swap.status:
+                    try:
+                        transition_swap(swap, new_status, force=True)
+                    except InvalidTransition as e:
+                        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+                
+                update_fields = []
                 if new_duration:
                     swap.duration = new_duration
+                    update_fields.append('duration')
                 if new_preferred_time:
                     swap.preferred_time = new_preferred_time
+                    update_fields.append('preferred_time')
                 
-                swap.save()
+                if update_fields:
+                    swap.save(update_fields=update_fields + ['updated_at'])
                 
                 return Response({
                     'message': f'Swap {swap.id} modified successfully',
@@ -826,9 +851,9 @@ class AdminEnhancedReportsView(generics.GenericAPIView):
         elif report_type == 'user_activity':
             return self._get_user_activity_report()
         elif report_type == 'swap_analytics':
-            return self._get_swap_analytics_report()
+            return self._get_swap_analytics_report(request)
         elif report_type == 'moderation':
-            return self._get_moderation_report()
+            return self._get_moderation_report(request)
         else:
             return Response(
                 {'error': 'Invalid report type'}, 
@@ -839,25 +864,28 @@ class AdminEnhancedReportsView(generics.GenericAPIView):
         """Get platform overview statistics"""
         now = timezone.now()
         month_ago = now - timedelta(days=30)
+        totals = metric_totals()
+        this_month = metric_totals(since=timezone.localdate() - timedelta(days=29))
         
         # User statistics
-        total_users = User.objects.count()
-        new_users_this_month = User.objects.filter(created_at__gte=month_ago).count()
+        total_users = totals.get('users.new', 0)
+        new_users_this_month = this_month.get('users.new', 0)
         active_users = User.objects.filter(last_login__gte=month_ago).count()
         banned_users = User.objects.filter(is_banned=True).count()
         
         # Swap statistics
-        total_swaps = SwapRequest.objects.count()
-        swaps_this_month = SwapRequest.objects.filter(created_at__gte=month_ago).count()
-        completed_swaps = SwapRequest.objects.filter(status='completed').count()
+        total_swaps = prefix_total(totals, 'swaps')
+        swaps_this_month = prefix_total(this_month, 'swaps')
+        completed_swaps = totals.get('swaps.completed', 0)
         completion_rate = (completed_swaps / total_swaps * 100) if total_swaps > 0 else 0
         
         # Report statistics
-        total_reports = UserReport.objects.count() + SkillReport.objects.count()
-        pending_reports = UserReport.objects.filter(status='pending').count() + SkillReport.objects.filter(status='pending').count()
+        total_reports = prefix_total(totals, 'user_reports') + prefix_total(totals, 'skill_reports')
+        pending_reports = totals.get('user_reports.pending', 0) + totals.get('skill_reports.pending', 0)
         
         # Rating statistics
-        avg_rating = SwapRating.objects.aggregate(avg=Avg('rating'))['avg'] or 0
+        rating_count = totals.get('ratings.count', 0)
+        avg_rating = totals.get('ratings.sum', 0) / rating_count if rating_count else 0
         
         data = {
             'platform_overview': {
@@ -880,27 +908,20 @@ class AdminEnhancedReportsView(generics.GenericAPIView):
     def _get_user_activity_report(self):
         """Get detailed user activity report"""
         # Top active users
-        top_active_users = User.objects.annotate(
-            swap_count=Count('sent_requests') + Count('received_requests'),
-            rating_count=Count('received_ratings')
+        ratings_received = SwapRating.objects.filter(
+            Q(swap_session__swap_request__from_user=OuterRef('pk')) |
+            Q(swap_session__swap_request__to_user=OuterRef('pk'))
+        ).exclude(from_user=OuterRef('pk')).order_by().values(total=Func('id', function='COUNT'))
+        top_active_users = annotate_admin_counts(User.objects.all()).annotate(
+            swap_count=F('total_swaps'),
+            rating_count=Subquery(ratings_received)
         ).order_by('-swap_count')[:10]
         
-        # User growth over time
-        user_growth = []
-        for i in range(12):  # Last 12 months
-            month_start = timezone.now().replace(day=1) - timedelta(days=30*i)
-            month_end = month_start.replace(day=28) + timedelta(days=4)
-            month_end = month_end.replace(day=1) - timedelta(days=1)
-            
-            new_users = User.objects.filter(
-                created_at__gte=month_start,
-                created_at__lte=month_end
-            ).count()
-            
-            user_growth.append({
-                'month': month_start.strftime('%Y-%m'),
-                'new_users': new_users
-            })
+        # User growth over the last 12 calendar months, newest first
+        user_growth = [
+            {'month': bucket['period'][:7], 'new_users': bucket['count']}
+            for bucket in reversed(time_series('users', 'month', *default_range('month')))
+        ]
         
         data = {
             'top_active_users': [
@@ -919,258 +940,165 @@ class AdminEnhancedReportsView(generics.GenericAPIView):
         
         return Response(data)
     
-    def _get_swap_analytics_report(self):
-        """Get detailed swap analytics"""
-        # Swap success rates by skill
-        from skills.models import Skill
-        
-        skill_success_rates = []
-        for skill in Skill.objects.all():
-            total_swaps = SwapRequest.objects.filter(
-                Q(skill_offered=skill) | Q(skill_wanted=skill)
-            ).count()
-            
-            completed_swaps = SwapRequest.objects.filter(
-                Q(skill_offered=skill) | Q(skill_wanted=skill),
-                status='completed'
-            ).count()
-            
-            success_rate = (completed_swaps / total_swaps * 100) if total_swaps > 0 else 0
-            
-            skill_success_rates.append({
-                'skill_name': skill.name,
-                'total_swaps': total_swaps,
-                'completed_swaps': completed_swaps,
-                'success_rate': round(success_rate, 2)
-            })
-        
-        # Swap trends over time
-        swap_trends = []
-        for i in range(12):  # Last 12 months
-            month_start = timezone.now().replace(day=1) - timedelta(days=30*i)
-            month_end = month_start.replace(day=28) + timedelta(days=4)
-            month_end = month_end.replace(day=1) - timedelta(days=1)
-            
-            total_swaps = SwapRequest.objects.filter(
-                created_at__gte=month_start,
-                created_at__lte=month_end
-            ).count()
-            
-            completed_swaps = SwapRequest.objects.filter(
-                created_at__gte=month_start,
-                created_at__lte=month_end,
-                status='completed'
-            ).count()
-            
-            swap_trends.append({
-                'month': month_start.strftime('%Y-%m'),
-                'total_swaps': total_swaps,
-                'completed_swaps': completed_swaps
+    def _get_swap_analytics_report(self, request):
+        """
+        Get detailed swap analytics. Skill success rates accept
+        ?sort= (success_rate, total_swaps, completed_swaps, skill_name; '-' for
+        descending), ?min_swaps=, and ?page= / ?page_size= to paginate.
+        """
+        try:
+            min_swaps = int(request.query_params.get('min_swaps', 0))
+            page = max(int(request.query_params.get('page', 1)), 1)
+            page_size = min(max(int(request.query_params.get('page_size', 20)), 1), 200)
+            rates = skill_success_rates(request.query_params.get('sort', 'skill_name'), min_swaps)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Swap success rates by skill, paginated when asked to
+        rates_pagination = {'total': len(rates)}
+        if 'page' in request.query_params or 'page_size' in request.query_params:
+            start = (page - 1) * page_size
+            rates_pagination.update({
+                'page': page,
+                'page_size': page_size,
+                'total_pages': (len(rates) + page_size - 1) // page_size
             })
+            rates = rates[start:start + page_size]
+        
+        # Swap trends over the last 12 calendar months, newest first
+        swap_trends = [
+            {
+                'month': bucket['period'][:7],
+                'total_swaps': bucket['count'],
+                'completed_swaps': bucket['by_status']['completed']
+            }
+            for bucket in reversed(time_series('swaps', 'month', *default_range('month')))
+        ]
         
         data = {
-            'skill_success_rates': skill_success_rates,
+            'skill_success_rates': rates,
+            'skill_success_rates_pagination': rates_pagination,
             'swap_trends': swap_trends
         }
         
         return Response(data)
     
-    def _get_moderation_report(self):
-        """Get moderation activity report"""
-        # Recent moderation actions
-        recent_bans = User.objects.filter(
-            is_banned=True,
-            ban_date__gte=timezone.now() - timedelta(days=30)
-        ).order_by('-ban_date')[:10]
-        
-        recent_reports = list(UserReport.objects.filter(
-            created_at__gte=timezone.now() - timedelta(days=30)
-        ).order_by('-created_at')[:10]) + list(SkillReport.objects.filter(
-            created_at__gte=timezone.now() - timedelta(days=30)
-        ).order_by('-created_at')[:10])
-        
-        # Sort by creation date
-        recent_reports.sort(key=lambda x: x.created_at, reverse=True)
+    def _get_moderation_report(self, request):
+        """Get moderation activity report; ?since=/?until= override the last 30 days"""
+        try:
+            since = parse_time_param(request, 'since') or timezone.now() - timedelta(days=30)
+            until = parse_time_param(request, 'until')
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Newest first, merged across sources; only ~10 rows are read from each table
+        recent_bans = moderation_events(['ban'], since=since, until=until, descending=True, limit=10)
+        recent_reports = moderation_events(
+            ['user_report', 'skill_report'], since=since, until=until, descending=True, limit=10
+        )
         
         data = {
             'recent_bans': [
                 {
-                    'user_id': user.id,
-                    'user_name': user.full_name,
-                    'ban_reason': user.ban_reason,
-                    'ban_date': user.ban_date,
-                    'banned_by': user.banned_by.full_name if user.banned_by else 'System'
+                    'user_id': event.object_id,
+                    'user_name': full_name(event.data['first_name'], event.data['last_name']),
+                    'ban_reason': event.data['ban_reason'],
+                    'ban_date': event.data['ban_date'],
+                    'banned_by': full_name(event.data['banned_by__first_name'], event.data['banned_by__last_name']) or 'System'
                 }
-                for user in recent_bans
+                for event in recent_bans
             ],
             'recent_reports': [
                 {
-                    'id': report.id,
-                    'type': 'User Report' if hasattr(report, 'reported_user') else 'Skill Report',
-                    'reporter': report.reporter.full_name,
-                    'reported_item': report.reported_user.full_name if hasattr(report, 'reported_user') else report.skill.name,
-                    'report_type': report.report_type,
-                    'status': report.status,
-                    'created_at': report.created_at
+                    'id': event.object_id,
+                    'type': 'User Report' if event.kind == 'user_report' else 'Skill Report',
+                    'reporter': full_name(event.data['reporter__first_name'], event.data['reporter__last_name']),
+                    'reported_item': (
+                        full_name(event.data['reported_user__first_name'], event.data['reported_user__last_name'])
+                        if event.kind == 'user_report' else event.data['skill__name']
+                    ),
+                    'report_type': event.data['report_type'],
+                    'status': event.data['status'],
+                    'created_at': event.data['created_at']
                 }
-                for report in recent_reports[:10]
+                for event in recent_reports
             ]
         }
         
         return Response(data)
 
-class DownloadEnhancedReportView(generics.GenericAPIView):
-    """Download enhanced reports as CSV"""
-    permission_classes = [IsAdminUser]
+class DownloadEnhancedReportView(ReportDownloadView):
+    """Download enhanced reports"""
     
     def get(self, request):
         report_type = request.query_params.get('type', 'user_activity')
         
         if report_type == 'user_activity':
-            return self._download_user_activity_report()
+            return self._download_user_activity_report(request)
         elif report_type == 'swap_analytics':
-            return self._download_swap_analytics_report()
+            return self._download_swap_analytics_report(request)
         elif report_type == 'moderation_log':
-            return self._download_moderation_log_report()
+            return self._download_moderation_log_report(request)
         else:
             return Response(
                 {'error': 'Invalid report type'}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
     
-    def _download_user_activity_report(self):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="enhanced_user_activity_report.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow([
-            'User ID', 'Username', 'Email', 'Full Name', 'Join Date', 'Last Login',
-            'Total Swaps', 'Completed Swaps', 'Cancelled Swaps', 'Average Rating',
-            'Reports Received', 'Reports Made', 'Is Banned', 'Ban Reason',
-            'Total Skills Offered', 'Total Skills Wanted'
-        ])
-        
-        users = User.objects.all()
-        for user in users:
-            total_swaps = SwapRequest.objects.filter(
-                Q(from_user=user) | Q(to_user=user)
-            ).count()
-            
-            completed_swaps = SwapRequest.objects.filter(
-                Q(from_user=user) | Q(to_user=user),
-                status='completed'
-            ).count()
-            
-            cancelled_swaps = SwapRequest.objects.filter(
-                Q(from_user=user) | Q(to_user=user),
-                status='cancelled'
-            ).count()
-            
-            user_ratings = SwapRating.objects.filter(
-                swap_session__swap_request__from_user=user
-            ).aggregate(avg_rating=Avg('rating'))['avg_rating'] or 0.0
-            
-            reports_received = UserReport.objects.filter(reported_user=user).count()
-            reports_made = UserReport.objects.filter(reporter=user).count()
-            
-            from skills.models import UserSkill
-            skills_offered = UserSkill.objects.filter(user=user, skill_type='offered').count()
-            skills_wanted = UserSkill.objects.filter(user=user, skill_type='wanted').count()
-            
-            writer.writerow([
-                user.id, user.username, user.email, user.full_name,
-                user.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-                user.last_login.strftime('%Y-%m-%d %H:%M:%S') if user.last_login else 'Never',
-                total_swaps, completed_swaps, cancelled_swaps, round(user_ratings, 2),
-                reports_received, reports_made, user.is_banned, user.ban_reason or '',
-                skills_offered, skills_wanted
-            ])
-        
-        return response
+    def _download_user_activity_report(self, request):
+        return self.stream_report(
+            request,
+            'enhanced_user_activity_report',
+            ENHANCED_USER_ACTIVITY_HEADER,
+            user_activity_rows,
+            delta=True,
+            enhanced=True
+        )
     
-    def _download_swap_analytics_report(self):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="swap_analytics_report.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow([
-            'Swap ID', 'From User', 'To User', 'Skill Offered', 'Skill Wanted',
-            'Status', 'Duration', 'Preferred Time', 'Created At', 'Updated At',
-            'Completion Date', 'Rating Given', 'Rating Received'
-        ])
-        
-        swaps = SwapRequest.objects.all().select_related(
-            'from_user', 'to_user', 'skill_offered', 'skill_wanted'
+    def _download_swap_analytics_report(self, request):
+        return self.stream_report(request, 'swap_analytics_report', SWAP_ANALYTICS_HEADER, swap_analytics_rows)
+    
+    def _download_moderation_log_report(self, request):
+        return self.stream_report(
+            request, 'moderation_log_report', MODERATION_LOG_HEADER, moderation_log_rows, time_range=True
         )
-        
-        for swap in swaps:
-            # Get completion date and ratings
-            completion_date = ''
-            rating_given = ''
-            rating_received = ''
-            
-            if swap.status == 'completed':
-                try:
-                    swap_session = SwapSession.objects.get(swap_request=swap)
-                    completion_date = swap_session.completed_at.strftime('%Y-%m-%d %H:%M:%S') if swap_session.completed_at else ''
-                    
-                    # Get ratings
-                    ratings = SwapRating.objects.filter(swap_session=swap_session)
-                    for rating in ratings:
-                        if rating.rater == swap.from_user:
-                            rating_given = rating.rating
-                        else:
-                            rating_received = rating.rating
-                except SwapSession.DoesNotExist:
-                    pass
-            
-            writer.writerow([
-                swap.id, swap.from_user.full_name, swap.to_user.full_name,
-                swap.skill_offered.name, swap.skill_wanted.name, swap.status,
-                swap.duration, swap.preferred_time,
-                swap.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-                swap.updated_at.strftime('%Y-%m-%d %H:%M:%S'),
-                completion_date, rating_given, rating_received
-            ])
-        
-        return response
+
+class ExportJobListCreateView(generics.ListCreateAPIView):
+    """Queue a report export for the background worker, or list recent export jobs"""
+    permission_classes = [IsAdminUser]
+    serializer_class = ExportJobSerializer
     
-    def _download_moderation_log_report(self):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="moderation_log_report.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow([
-            'Action Type', 'Target', 'Action By', 'Action Date', 'Reason/Notes',
-            'Status', 'Related Reports'
-        ])
-        
-        # User bans
-        banned_users = User.objects.filter(is_banned=True)
-        for user in banned_users:
-            writer.writerow([
-                'User Ban', user.full_name, user.banned_by.full_name if user.banned_by else 'System',
-                user.ban_date.strftime('%Y-%m-%d %H:%M:%S') if user.ban_date else '',
-                user.ban_reason or '', 'Active', ''
-            ])
-        
-        # Report resolutions
-        resolved_reports = list(UserReport.objects.filter(
-            status__in=['resolved', 'dismissed']
-        )) + list(SkillReport.objects.filter(
-            status__in=['approved', 'rejected', 'skill_removed']
-        ))
-        
-        for report in resolved_reports:
-            report_type = 'User Report' if hasattr(report, 'reported_user') else 'Skill Report'
-            target = report.reported_user.full_name if hasattr(report, 'reported_user') else report.skill.name
-            
-            writer.writerow([
-                f'{report_type} Resolution', target,
-                report.resolved_by.full_name if report.resolved_by else 'System',
-                report.resolved_at.strftime('%Y-%m-%d %H:%M:%S') if report.resolved_at else '',
-                report.admin_notes or '', report.status, report.id
-            ])
+    def get_queryset(self):
+        return ExportJob.objects.select_related('requested_by')
+    
+    def create(self, request, *args, **kwargs):
+        export_type = request.data.get('export_type')
+        if export_type not in EXPORTS:
+            return Response(
+                {'error': f'Invalid export type. Choose from: {", ".join(EXPORTS)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        return response
+        job = ExportJob.objects.create(export_type=export_type, requested_by=request.user)
+        return Response(self.get_serializer(job).data, status=status.HTTP_202_ACCEPTED)
 
+class ExportJobDetailView(generics.RetrieveAPIView):
+    """Poll the status and progress of an export job"""
+    permission_classes = [IsAdminUser]
+    serializer_class = ExportJobSerializer
+    queryset = ExportJob.objects.select_related('requested_by')
+
+class ExportJobDownloadView(generics.GenericAPIView):
+    """Download a finished export; supports Range requests for resuming"""
+    permission_classes = [IsAdminUser]
+    queryset = ExportJob.objects.all()
+    
+    def get(self, request, pk):
+        job = self.get_object()
+        if job.status == 'expired':
+            return Response({'error': 'This export has expired'}, status=status.HTTP_410_GONE)
+        if job.status != 'completed' or not job.file:
+            return Response({'error': 'Export is not ready yet'}, status=status.HTTP_409_CONFLICT)
+        
+        filename, _, _ = EXPORTS[job.export_type]
+        return ranged_file_response(request, job.file, filename)
@@ -0,0 +1,111 @@
+"""
+Skill co-occurrence: "users who offer X also offer/want Y".
+
+SkillCooccurrence is a sparse matrix over (skill, skill_type) entries. Each
+row counts the users who hold both entries. The diagonal row (an entry paired
+with itself) holds the number of users with that entry, which is the
+denominator of the `share` figure.
+
+rebuild_cooccurrence() recomputes the whole matrix with one grouped self-join
+of UserSkill in the database. Between rebuilds, the UserSkill signals in
+skills.signals adjust only the row and column of the entry that was added or
+removed. related_skills() reads the rows of the input entries off the
+(skill, skill_type, -users) index.
+"""
+from django.apps import apps as global_apps
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+
+def _entries_query(entries, skill_field='skill_id', type_field='skill_type'):
+    query = Q(pk__in=[])
+    for skill_id, skill_type in entries:
+        query |= Q(**{skill_field: skill_id, type_field: skill_type})
+    return query
+
+def adjust_cooccurrence(entry, others, delta):
+    """
+    Add `delta` users to the pairs of `entry` with each entry in `others`
+    (both directions) and to the diagonal row of `entry`. Entries are
+    (skill_id, skill_type) tuples. A positive delta creates missing rows;
+    a negative one only updates rows that exist.
+    """
+    SkillCooccurrence = global_apps.get_model('skills', 'SkillCooccurrence')
+    skill_id, skill_type = entry
+    others = [other for other in others if other != entry]
+    if delta > 0:
+        rows = [
+            SkillCooccurrence(skill_id=skill_id, skill_type=skill_type, related_skill_id=other[0], related_type=other[1])
+            for other in [entry] + others
+        ] + [
+            SkillCooccurrence(skill_id=other[0], skill_type=other[1], related_skill_id=skill_id, related_type=skill_type)
+            for other in others
+        ]
+        SkillCooccurrence.objects.bulk_create(rows, ignore_conflicts=True)
+
+    SkillCooccurrence.objects.filter(
+        _entries_query([entry] + others, 'related_skill_id', 'related_type'), skill_id=skill_id, skill_type=skill_type
+    ).update(users=F('users') + delta)
+    if others:
+        SkillCooccurrence.objects.filter(
+            _entries_query(others), related_skill_id=skill_id, related_type=skill_type
+        ).update(users=F('users') + delta)
+
+def rebuild_cooccurrence():
+    """Recompute every SkillCooccurrence row from UserSkill"""
+    SkillCooccurrence = global_apps.get_model('skills', 'SkillCooccurrence')
+    rows = global_apps.get_model('skills', 'UserSkill').objects.annotate(
+        related_skill=F('user__userskill__skill_id'),
+        related_type=F('user__userskill__skill_type')
+    ).values('skill_id', 'skill_type', 'related_skill', 'related_type').annotate(
+        users=Count('user_id')
+    ).order_by()
+    with transaction.atomic():
+        SkillCooccurrence.objects.all().delete()
+        SkillCooccurrence.objects.bulk_create(
+            (
+                SkillCooccurrence(
+                    skill_id=row['skill_id'], skill_type=row['skill_type'],
+                    related_skill_id=row['related_skill'], related_type=row['related_type'],
+                    users=row['users']
+                )
+                for row in rows.iterator()
+            ),
+            batch_size=1000
+        )
+    return SkillCooccurrence.objects.count()
+
+def related_skills(entries, related_type=None, limit=10):
+    """
+    Skills most often held alongside every entry in `entries`, as
+    [{'skill_id', 'skill_name', 'category', 'skill_type', 'users', 'share'}].
+    `users` sums the co-occurrence counts over the inputs and `share` divides
+    that by the summed number of users holding each input (as a percentage).
+    Input skills are never suggested back. `related_type` restricts the
+    suggestions to offered or wanted skills.
+    """
+    SkillCooccurrence = global_apps.get_model('skills', 'SkillCooccurrence')
+    entries = list(dict.fromkeys(entries))
+    input_ids = {skill_id for skill_id, _ in entries}
+    rows = SkillCooccurrence.objects.filter(_entries_query(entries), users__gt=0)
+
+    support = sum(
+        rows.filter(related_skill_id=F('skill_id'), related_type=F('skill_type')).values_list('users', flat=True)
+    )
+    related = rows.exclude(related_skill_id__in=input_ids)
+    if related_type is not None:
+        related = related.filter(related_type=related_type)
+    ranked = related.values(
+        'related_skill_id', 'related_skill__name', 'related_skill__category', 'related_type'
+    ).annotate(total=Sum('users')).order_by('-total', 'related_skill__name')[:limit]
+
+    return [
+        {
+            'skill_id': row['related_skill_id'],
+            'skill_name': row['related_skill__name'],
+            'category': row['related_skill__category'],
+            'skill_type': row['related_type'],
+            'users': row['total'],
+            'share': round(row['total'] / support * 100, 2) if support else 0,
+        }
+        for row in ranked
+    ]
@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from skills.cooccurrence import rebuild_cooccurrence
+
+class Command(BaseCommand):
+    help = 'Recompute the skill co-occurrence matrix from the user skills'
+
+    def handle(self, *args, **options):
+        rows = rebuild_cooccurrence()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} skill co-occurrence rows'))
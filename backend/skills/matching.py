@@ -0,0 +1,85 @@
+"""
+Reciprocal partner matching.
+
+A partner is reciprocal when they offer a skill the user wants *and* want
+a skill the user offers. UserSkill's (skill, skill_type, user) index is
+the inverted index from skill to offering/wanting users, so every lookup
+here is a range scan over the user's own skills rather than a full scan of
+UserSkill. The grouped query still aggregates every holder of every
+overlapping skill, so the cost grows with how popular the user's skills
+are, not with the number of users on the platform.
+
+Partners who share no availability slot with the user are left out, and
+ties on score go to the partner with more shared slots (see
+accounts/availability.py).
+"""
+from django.contrib.auth import get_user_model
+from django.db.models import Count, F, Q
+from accounts import availability
+from .models import UserSkill
+
+def _own_skill_ids(user):
+    offered, wanted = set(), set()
+    for skill_id, skill_type in UserSkill.objects.filter(user=user).values_list('skill_id', 'skill_type'):
+        (offered if skill_type == 'offered' else wanted).add(skill_id)
+    return offered, wanted
+
+def find_reciprocal_matches(user, limit=20):
+    """Return up to `limit` ranked partners with the skills that overlap in each direction"""
+    offered, wanted = _own_skill_ids(user)
+    if not offered or not wanted:
+        return []
+
+    overlap = (
+        Q(skill_type='offered', skill_id__in=wanted) |
+        Q(skill_type='wanted', skill_id__in=offered)
+    )
+    ranked = (
+        UserSkill.objects
+        .filter(
+            overlap, user__is_active=True, user__is_banned=False,
+            user__availability_mask__in=availability.compatible_masks(user.availability_mask)
+        )
+        .exclude(user=user)
+        .values('user_id')
+        .annotate(
+            they_offer=Count('id', filter=Q(skill_type='offered')),
+            they_want=Count('id', filter=Q(skill_type='wanted')),
+        )
+        .filter(they_offer__gt=0, they_want__gt=0)
+        .annotate(
+            score=F('they_offer') + F('they_want'),
+            shared_slots=availability.overlap('user__availability_mask', user.availability_mask),
+        )
+        .order_by('-score', '-shared_slots', '-user__rating', 'user_id')[:limit]
+    )
+    ranked = list(ranked)
+    if not ranked:
+        return []
+
+    user_ids = [row['user_id'] for row in ranked]
+    overlapping = {user_id: {'offered': [], 'wanted': []} for user_id in user_ids}
+    rows = UserSkill.objects.filter(overlap, user_id__in=user_ids).values_list(
+        'user_id', 'skill_type', 'skill_id', 'skill__name'
+    )
+    for user_id, skill_type, skill_id, skill_name in rows:
+        overlapping[user_id][skill_type].append({'id': skill_id, 'name': skill_name})
+
+    User = get_user_model()
+    profiles = User.objects.in_bulk(user_ids)
+
+    matches = []
+    for row in ranked:
+        partner = profiles[row['user_id']]
+        matches.append({
+            'user_id': partner.id,
+            'user_name': partner.full_name,
+            'avatar': partner.avatar.url if partner.avatar else None,
+            'location': partner.location,
+            'rating': partner.rating,
+            'score': row['score'],
+            'shared_availability_slots': row['shared_slots'],
+            'they_offer': overlapping[partner.id]['offered'],
+            'they_want': overlapping[partner.id]['wanted'],
+        })
+    return matches
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-17 17:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userskill',
+            index=models.Index(fields=['skill', 'skill_type', 'user'], name='userskill_skill_type_user_idx'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.30 on 2026-10-17 18:14
+
+from django.db import migrations, models
+from django.db.models import Count, F
+import django.db.models.deletion
+
+
+def backfill_cooccurrence(apps, schema_editor):
+    SkillCooccurrence = apps.get_model('skills', 'SkillCooccurrence')
+    rows = apps.get_model('skills', 'UserSkill').objects.annotate(
+        related_skill=F('user__userskill__skill_id'),
+        related_type=F('user__userskill__skill_type')
+    ).values('skill_id', 'skill_type', 'related_skill', 'related_type').annotate(
+        users=Count('user_id')
+    ).order_by()
+    SkillCooccurrence.objects.bulk_create(
+        (
+            SkillCooccurrence(
+                skill_id=row['skill_id'], skill_type=row['skill_type'],
+                related_skill_id=row['related_skill'], related_type=row['related_type'],
+                users=row['users']
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0002_userskill_inverted_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillCooccurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('skill_type', models.CharField(choices=[('offered', 'Offered'), ('wanted', 'Wanted')], max_length=10)),
+                ('related_type', models.CharField(choices=[('offered', 'Offered'), ('wanted', 'Wanted')], max_length=10)),
+                ('users', models.BigIntegerField(default=0)),
+                ('related_skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='skills.skill')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='skills.skill')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['skill', 'skill_type', '-users'], name='cooccurrence_top_idx')],
+                'unique_together': {('skill', 'skill_type', 'related_skill', 'related_type')},
+            },
+        ),
+        migrations.RunPython(backfill_cooccurrence, migrations.RunPython.noop),
+    ]
@@ -40,6 +40,25 @@ class UserSkill(models.Model):
 
     class Meta:
         unique_together = ['user', 'skill', 'skill_type']
+        indexes = [
+            # Inverted index: skill -> users offering / wanting it
+            models.Index(fields=['skill', 'skill_type', 'user'], name='userskill_skill_type_user_idx'),
+        ]
         
     def __str__(self):
         return f"{self.user.full_name} - {self.skill.name} ({self.skill_type})"
+
+class SkillCooccurrence(models.Model):
+    """How many users hold both (skill, skill_type) and (related_skill, related_type); maintained by skills.cooccurrence"""
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='+')
+    skill_type = models.CharField(max_length=10, choices=UserSkill.SKILL_TYPE_CHOICES)
+    related_skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='+')
+    related_type = models.CharField(max_length=10, choices=UserSkill.SKILL_TYPE_CHOICES)
+    users = models.BigIntegerField(default=0)
+
+    class Meta:
+        unique_together = ['skill', 'skill_type', 'related_skill', 'related_type']
+        indexes = [
+            # Top-k related skills for one input skill is a range scan
+            models.Index(fields=['skill', 'skill_type', '-users'], name='cooccurrence_top_idx'),
+        ]
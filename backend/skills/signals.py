@@ -0,0 +1,89 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from .models import Skill, UserSkill
+from .cooccurrence import adjust_cooccurrence
+from .similarity import refresh_similarity_norms
+
+def refresh_skill_summaries(user_ids):
+    """Rebuild the denormalized skills_offered/skills_wanted lists for the given users"""
+    User = get_user_model()
+    user_ids = list(user_ids)
+
+    for start in range(0, len(user_ids), 500):
+        chunk = user_ids[start:start + 500]
+        summaries = {user_id: {'offered': [], 'wanted': []} for user_id in chunk}
+        rows = UserSkill.objects.filter(user_id__in=chunk).order_by('id').values_list(
+            'user_id', 'skill_type', 'skill__name'
+        )
+        for user_id, skill_type, name in rows:
+            summaries[user_id][skill_type].append(name)
+
+        for user_id, summary in summaries.items():
+            User.objects.filter(pk=user_id).update(
+                skills_offered_summary=summary['offered'],
+                skills_wanted_summary=summary['wanted'],
+                updated_at=timezone.now(),
+            )
+
+@receiver(post_save, sender=UserSkill)
+@receiver(post_delete, sender=UserSkill)
+def user_skill_changed(sender, instance, **kwargs):
+    refresh_skill_summaries([instance.user_id])
+    refresh_similarity_norms([instance.user_id])
+
+@receiver(post_save, sender=Skill)
+def skill_saved(sender, instance, created, update_fields=None, **kwargs):
+    # Only a rename can change the summaries of users who already hold the skill
+    if created or (update_fields is not None and 'name' not in update_fields):
+        return
+    user_ids = UserSkill.objects.filter(skill=instance).values_list('user_id', flat=True).distinct()
+    refresh_skill_summaries(user_ids)
+
+SIMILARITY_PROFILE_FIELDS = ('experience_level', 'availability')
+
+@receiver(pre_save, sender=get_user_model())
+def remember_similarity_profile(sender, instance, update_fields=None, **kwargs):
+    # experience_level and availability are part of the similarity vector;
+    # note whether this save changes them so post_save can skip the refresh
+    instance._similarity_profile_changed = False
+    if update_fields is not None and not set(SIMILARITY_PROFILE_FIELDS) & set(update_fields):
+        return
+    new = tuple(getattr(instance, field) for field in SIMILARITY_PROFILE_FIELDS)
+    if instance.pk is None:
+        instance._similarity_profile_changed = any(new)
+        return
+    old = sender.objects.filter(pk=instance.pk).values_list(*SIMILARITY_PROFILE_FIELDS).first()
+    instance._similarity_profile_changed = old is None or old != new
+
+@receiver(post_save, sender=get_user_model())
+def user_profile_saved(sender, instance, **kwargs):
+    if instance._similarity_profile_changed:
+        refresh_similarity_norms([instance.pk])
+
+# Skill co-occurrence (see skills/cooccurrence.py)
+
+@receiver(post_save, sender=UserSkill)
+def count_cooccurrence(sender, instance, created, **kwargs):
+    if not created:
+        return
+    others = UserSkill.objects.filter(user_id=instance.user_id).exclude(pk=instance.pk)
+    adjust_cooccurrence((instance.skill_id, instance.skill_type), others.values_list('skill_id', 'skill_type'), 1)
+
+@receiver(pre_delete, sender=UserSkill)
+def remember_cooccurrence(sender, instance, **kwargs):
+    instance._cooccurrence_siblings = list(
+        UserSkill.objects.filter(user_id=instance.user_id).exclude(pk=instance.pk).values_list(
+            'pk', 'skill_id', 'skill_type'
+        )
+    )
+
+@receiver(post_delete, sender=UserSkill)
+def uncount_cooccurrence(sender, instance, **kwargs):
+    siblings = getattr(instance, '_cooccurrence_siblings', [])
+    remaining = set(UserSkill.objects.filter(pk__in=[pk for pk, _, _ in siblings]).values_list('pk', flat=True))
+    # When both skills of a pair go in one delete (e.g. a cascade from the
+    # user), only the one with the higher pk removes the pair
+    others = [(skill_id, skill_type) for pk, skill_id, skill_type in siblings if pk in remaining or pk < instance.pk]
+    adjust_cooccurrence((instance.skill_id, instance.skill_type), others, -1)
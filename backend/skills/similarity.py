@@ -0,0 +1,125 @@
+"""
+Similar users by cosine similarity of profile vectors.
+
+A user's vector has one component per UserSkill entry, (skill, 'offered')
+weighted by proficiency and (skill, 'wanted') weighted WANTED_WEIGHT, plus
+one component each for their experience_level and availability. The vector's
+length is stored in User.similarity_norm and kept current by skills.signals.
+
+similar_users() doesn't compare against every profile. Candidates come from
+UserSkill's (skill, skill_type, user) inverted index: only users who share at
+least one skill entry can score above the profile features alone. The dot
+products and the division by both norms are one grouped query.
+"""
+import math
+from django.contrib.auth import get_user_model
+from django.db.models import Case, F, FloatField, Q, Sum, Value, When
+from django.db.models.functions import Coalesce
+from .models import UserSkill
+
+PROFICIENCY_WEIGHTS = {
+    'beginner': 1.0,
+    'intermediate': 2.0,
+    'advanced': 3.0,
+    'expert': 4.0,
+}
+DEFAULT_PROFICIENCY_WEIGHT = 2.0
+WANTED_WEIGHT = 1.0
+PROFILE_WEIGHT = 1.0
+
+def entry_weight(skill_type, proficiency_level):
+    if skill_type == 'wanted':
+        return WANTED_WEIGHT
+    return PROFICIENCY_WEIGHTS.get(proficiency_level, DEFAULT_PROFICIENCY_WEIGHT)
+
+def vector_norm(skill_rows, experience_level, availability):
+    """Length of the vector for (skill_type, proficiency_level) rows and profile fields"""
+    squares = sum(entry_weight(skill_type, level) ** 2 for skill_type, level in skill_rows)
+    squares += PROFILE_WEIGHT ** 2 * (bool(experience_level) + bool(availability))
+    return math.sqrt(squares)
+
+def refresh_similarity_norms(user_ids):
+    """Recompute User.similarity_norm for the given users"""
+    User = get_user_model()
+    user_ids = list(user_ids)
+
+    for start in range(0, len(user_ids), 500):
+        chunk = user_ids[start:start + 500]
+        skill_rows = {user_id: [] for user_id in chunk}
+        for user_id, skill_type, level in UserSkill.objects.filter(user_id__in=chunk).values_list(
+            'user_id', 'skill_type', 'proficiency_level'
+        ):
+            skill_rows[user_id].append((skill_type, level))
+
+        for user_id, experience_level, availability in User.objects.filter(pk__in=chunk).values_list(
+            'pk', 'experience_level', 'availability'
+        ):
+            User.objects.filter(pk=user_id).update(
+                similarity_norm=vector_norm(skill_rows[user_id], experience_level, availability)
+            )
+
+def _their_weight():
+    return Case(
+        When(skill_type='wanted', then=Value(WANTED_WEIGHT)),
+        *[When(proficiency_level=level, then=Value(weight)) for level, weight in PROFICIENCY_WEIGHTS.items()],
+        default=Value(DEFAULT_PROFICIENCY_WEIGHT),
+        output_field=FloatField()
+    )
+
+def _profile_match(field, value):
+    if not value:
+        return Value(0.0)
+    return Case(When(**{f'user__{field}': value}, then=Value(PROFILE_WEIGHT ** 2)), default=Value(0.0))
+
+def similar_users(user, limit=20):
+    """Return up to `limit` users ranked by cosine similarity, with the skill entries they share"""
+    rows = list(UserSkill.objects.filter(user=user).values_list('skill_id', 'skill_type', 'proficiency_level'))
+    own = {(skill_id, skill_type): entry_weight(skill_type, level) for skill_id, skill_type, level in rows}
+    norm = vector_norm([(skill_type, level) for _, skill_type, level in rows], user.experience_level, user.availability)
+    if not own or not norm:
+        return []
+
+    shared = Q(pk__in=[])
+    for skill_id, skill_type in own:
+        shared |= Q(skill_id=skill_id, skill_type=skill_type)
+    own_weight = Case(
+        *[When(skill_id=skill_id, skill_type=skill_type, then=Value(weight)) for (skill_id, skill_type), weight in own.items()],
+        default=Value(0.0),
+        output_field=FloatField()
+    )
+    ranked = list(
+        UserSkill.objects
+        .filter(shared, user__is_active=True, user__is_banned=False, user__similarity_norm__gt=0)
+        .exclude(user=user)
+        .values('user_id')
+        .annotate(dot=Coalesce(Sum(own_weight * _their_weight()), Value(0.0)))
+        .annotate(score=(
+            F('dot') + _profile_match('experience_level', user.experience_level)
+            + _profile_match('availability', user.availability)
+        ) / (F('user__similarity_norm') * Value(norm)))
+        .order_by('-score', '-user__rating', 'user_id')[:limit]
+    )
+    if not ranked:
+        return []
+
+    user_ids = [row['user_id'] for row in ranked]
+    shared_skills = {user_id: [] for user_id in user_ids}
+    for user_id, skill_type, skill_id, skill_name in UserSkill.objects.filter(shared, user_id__in=user_ids).values_list(
+        'user_id', 'skill_type', 'skill_id', 'skill__name'
+    ):
+        shared_skills[user_id].append({'id': skill_id, 'name': skill_name, 'skill_type': skill_type})
+
+    profiles = get_user_model().objects.in_bulk(user_ids)
+    results = []
+    for row in ranked:
+        partner = profiles[row['user_id']]
+        results.append({
+            'user_id': partner.id,
+            'user_name': partner.full_name,
+            'avatar': partner.avatar.url if partner.avatar else None,
+            'location': partner.location,
+            'rating': partner.rating,
+            'similarity': round(row['score'], 4),
+            'shared_skills': shared_skills[partner.id],
+        })
+    return results
@@ -4,6 +4,9 @@ from . import views
 urlpatterns = [
     path('', views.SkillListView.as_view(), name='skill_list'),
     path('discover/', views.discover_skills, name='discover_skills'),
+    path('matches/', views.reciprocal_matches, name='reciprocal_matches'),
+    path('related/', views.related_skills_view, name='related_skills'),
+    path('similar-users/', views.similar_users_view, name='similar_users'),
     path('user-skills/', views.UserSkillListView.as_view(), name='user_skills'),
     path('user-skills/<int:pk>/delete/', views.delete_user_skill, name='delete_user_skill'),
     path('user-skills/<str:skill_type>/', views.user_skills_by_type, name='user_skills_by_type'),
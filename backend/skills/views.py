@@ -1,9 +1,15 @@
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from django.db.models import Count, Q
+from rest_framework.pagination import PageNumberPagination
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import RowNumber
+from accounts.availability import compatible_masks
 from .models import Skill, UserSkill
 from .serializers import SkillSerializer, UserSkillSerializer, UserSkillCreateSerializer
+from .matching import find_reciprocal_matches
+from .cooccurrence import related_skills
+from .similarity import similar_users
 
 class SkillListView(generics.ListAPIView):
     queryset = Skill.objects.all()
@@ -50,61 +56,153 @@ def user_skills_by_type(request, skill_type):
     serializer = UserSkillSerializer(skills, many=True)
     return Response(serializer.data)
 
+class DiscoverSkillsPagination(PageNumberPagination):
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def discover_skills(request):
     """
-    Discover skills that other users have - shows skills with user information
+    Discover skills that other users have - skills are grouped and counted in
+    the database, paginated, and carry at most `users_per_skill` users each.
+    ?available=true keeps only users who share an availability slot with the current user
     """
     # Get all UserSkills except the current user's
-    user_skills = UserSkill.objects.exclude(user=request.user).select_related('user', 'skill')
+    user_skills = UserSkill.objects.exclude(user=request.user)
     
     # Apply filters
     search = request.query_params.get('search', '')
     category = request.query_params.get('category', '')
     skill_type = request.query_params.get('skill_type', '')
+    try:
+        users_per_skill = max(0, min(int(request.query_params.get('users_per_skill', 5)), 20))
+    except ValueError:
+        return Response({'error': 'Invalid users_per_skill'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    if request.query_params.get('available') == 'true':
+        user_skills = user_skills.filter(
+            user__availability_mask__in=compatible_masks(request.user.availability_mask)
+        )
     
     if search:
         user_skills = user_skills.filter(
             Q(skill__name__icontains=search) | 
             Q(skill__description__icontains=search) |
-            Q(user__full_name__icontains=search)
+            Q(user__first_name__icontains=search) |
+            Q(user__last_name__icontains=search)
         )
     
+    # Facet counts apply every filter except their own
+    category_facets = user_skills
+    skill_type_facets = user_skills
+    
     if category and category != 'all':
         user_skills = user_skills.filter(skill__category=category)
+        skill_type_facets = skill_type_facets.filter(skill__category=category)
     
     if skill_type:
         user_skills = user_skills.filter(skill_type=skill_type)
+        category_facets = category_facets.filter(skill_type=skill_type)
+    
+    # One grouped query per page, most popular skills first
+    skills = user_skills.values(
+        'skill_id', 'skill__name', 'skill__category', 'skill__description'
+    ).annotate(user_count=Count('id')).order_by('-user_count', 'skill__name')
+    
+    paginator = DiscoverSkillsPagination()
+    page = paginator.paginate_queryset(skills, request)
+    
+    # Newest users for the skills on this page only, capped per skill
+    users_by_skill = {row['skill_id']: [] for row in page}
+    if users_per_skill and page:
+        ranked_users = user_skills.filter(skill_id__in=users_by_skill).annotate(
+            row_number=Window(
+                expression=RowNumber(),
+                partition_by=[F('skill_id')],
+                order_by=[F('created_at').desc(), F('id').desc()]
+            )
+        ).filter(row_number__lte=users_per_skill).values(
+            'skill_id', 'user_id', 'user__first_name', 'user__last_name',
+            'skill_type', 'proficiency_level', 'created_at'
+        )
+        for row in ranked_users:
+            users_by_skill[row['skill_id']].append({
+                'user_id': row['user_id'],
+                'user_name': f"{row['user__first_name']} {row['user__last_name']}".strip(),
+                'skill_type': row['skill_type'],
+                'proficiency_level': row['proficiency_level'],
+                'created_at': row['created_at']
+            })
+    
+    result = [
+        {
+            'id': row['skill_id'],
+            'name': row['skill__name'],
+            'category': row['skill__category'],
+            'description': row['skill__description'],
+            'user_count': row['user_count'],
+            'users': users_by_skill[row['skill_id']]
+        }
+        for row in page
+    ]
+    
+    response = paginator.get_paginated_response(result)
+    response.data['facets'] = {
+        'category': dict(
+            category_facets.values_list('skill__category').annotate(count=Count('id')).order_by()
+        ),
+        'skill_type': dict(
+            skill_type_facets.values_list('skill_type').annotate(count=Count('id')).order_by()
+        ),
+    }
+    return response
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def reciprocal_matches(request):
+    """
+    Users who offer what the current user wants and want what they offer
+    """
+    try:
+        limit = max(1, min(int(request.query_params.get('limit', 20)), 50))
+    except ValueError:
+        return Response({'error': 'Invalid limit'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response(find_reciprocal_matches(request.user, limit=limit))
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def similar_users_view(request):
+    """
+    Users whose skills and profile are most like the current user's
+    """
+    try:
+        limit = max(1, min(int(request.query_params.get('limit', 20)), 50))
+    except ValueError:
+        return Response({'error': 'Invalid limit'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response(similar_users(request.user, limit=limit))
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def related_skills_view(request):
+    """
+    Skills that users holding the given skills also offer or want.
+    ?skills=1,2 (skill ids) ?skill_type=offered|wanted (of the inputs, default offered)
+    ?related_type=offered|wanted ?limit= (max 50)
+    """
+    skill_type = request.query_params.get('skill_type', 'offered')
+    related_type = request.query_params.get('related_type') or None
+    if skill_type not in ['offered', 'wanted'] or related_type not in [None, 'offered', 'wanted']:
+        return Response({'error': 'Invalid skill type'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        skill_ids = [int(skill_id) for skill_id in request.query_params.get('skills', '').split(',') if skill_id]
+        limit = max(1, min(int(request.query_params.get('limit', 10)), 50))
+    except ValueError:
+        return Response({'error': 'skills must be comma-separated ids and limit an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    if not skill_ids:
+        return Response({'error': 'At least one skill is required'}, status=status.HTTP_400_BAD_REQUEST)
     
-    # Group by skill and include user information
-    skills_data = {}
-    for user_skill in user_skills:
-        skill_id = user_skill.skill.id
-        if skill_id not in skills_data:
-            skills_data[skill_id] = {
-                'id': user_skill.skill.id,
-                'name': user_skill.skill.name,
-                'category': user_skill.skill.category,
-                'description': user_skill.skill.description,
-                'users': []
-            }
-        
-        skills_data[skill_id]['users'].append({
-            'user_id': user_skill.user.id,
-            'user_name': user_skill.user.full_name,
-            'skill_type': user_skill.skill_type,
-            'proficiency_level': user_skill.proficiency_level,
-            'created_at': user_skill.created_at
-        })
-    
-    # Convert to list and add user count
-    result = []
-    for skill_data in skills_data.values():
-        skill_data['user_count'] = len(skill_data['users'])
-        result.append(skill_data)
-    
-    # Sort by user count (most popular first)
-    result.sort(key=lambda x: x['user_count'], reverse=True)
-    
-    return Response(result)
+    entries = [(skill_id, skill_type) for skill_id in skill_ids[:20]]
+    return Response(related_skills(entries, related_type=related_type, limit=limit))
@@ -0,0 +1,31 @@
+"""
+Shared pagination classes.
+
+PageNumberPagination stays the project default; list views that can grow
+without bound opt into keyset pagination with ?pagination=cursor. This is
+DRF's CursorPagination: the cursor holds the created_at of the page's edge
+row and seeks with created_at < value, never issuing a COUNT(*). Only rows
+sharing that exact created_at are skipped by offset (id keeps their order
+stable), so a page costs the same however deep it is unless many rows share
+one timestamp.
+"""
+from rest_framework.pagination import CursorPagination
+from rest_framework.settings import api_settings
+
+class KeysetPagination(CursorPagination):
+    ordering = ('-created_at', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+def wants_keyset_pagination(request):
+    params = request.query_params
+    return params.get('pagination') == 'cursor' or 'cursor' in params
+
+class OptionalKeysetPaginationMixin:
+    """Use KeysetPagination when the client asks for it, the default paginator otherwise"""
+
+    @property
+    def pagination_class(self):
+        if wants_keyset_pagination(self.request):
+            return KeysetPagination
+        return api_settings.DEFAULT_PAGINATION_CLASS
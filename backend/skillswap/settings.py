@@ -4,6 +4,7 @@ Django settings for skillswap project.
 
 from pathlib import Path
 import os
+from datetime import timedelta
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -115,6 +116,27 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 10
 }
 
+# User directory search (see accounts/search.py). The backend follows the
+# database: FTS5 on SQLite, icontains elsewhere. Set USER_SEARCH_BACKEND to a
+# dotted path to override it.
+USER_SEARCH_MAX_RESULTS = 200
+
+# Seconds a cached status histogram may be served (see accounts/histograms.py)
+STATUS_HISTOGRAM_TIMEOUT = 30
+# Seconds a cached analytics time series may be served (see accounts/timeseries.py)
+TIME_SERIES_TIMEOUT = 300
+# Seconds cached skill-pair analytics may be served (see swaps/pairs.py)
+SKILL_PAIR_STATS_TIMEOUT = 60
+
+# Background report exports (see accounts/export_jobs.py)
+EXPORT_RETENTION = timedelta(days=7)
+# Export workers refresh a running job's heartbeat this often (seconds);
+# jobs whose heartbeat is older than EXPORT_STALE_AFTER are requeued
+EXPORT_HEARTBEAT_INTERVAL = 30
+EXPORT_STALE_AFTER = timedelta(minutes=5)
+# Process pool size run_export_worker uses for partitioned exports
+EXPORT_WORKER_PROCESSES = 1
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:5173",  # Vite default port
@@ -127,7 +149,7 @@ CORS_ALLOWED_ORIGINS = [
 
 CORS_ALLOW_CREDENTIALS = True
 CORS_ALLOW_ALL_ORIGINS = False  # Explicitly set to False for security
-CORS_EXPOSE_HEADERS = ['Set-Cookie']  # Expose Set-Cookie header
+CORS_EXPOSE_HEADERS = ['Set-Cookie', 'X-Export-Watermark']  # Expose Set-Cookie and the delta export watermark
 
 # CSRF settings for API
 CSRF_TRUSTED_ORIGINS = [
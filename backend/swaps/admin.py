@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import SwapRequest, SwapSession, SwapRating
+from .models import SwapRequest, SwapSession, SwapRating, SwapCycle, SwapCycleLeg
+from .transitions import transition_swap
 
 @admin.register(SwapRequest)
 class SwapRequestAdmin(admin.ModelAdmin):
@@ -7,6 +8,18 @@ class SwapRequestAdmin(admin.ModelAdmin):
     list_filter = ('status', 'duration', 'preferred_time', 'created_at')
     search_fields = ('from_user__email', 'to_user__email', 'skill_offered__name', 'skill_wanted__name')
 
+    def save_model(self, request, obj, form, change):
+        # Save everything but the status, then move the status through
+        # transition_swap so completed_swaps and the rollups stay in step
+        new_status = obj.status
+        if change:
+            obj.status = SwapRequest.objects.filter(pk=obj.pk).values_list('status', flat=True).first()
+        else:
+            obj.status = 'pending'
+        super().save_model(request, obj, form, change)
+        if new_status != obj.status:
+            transition_swap(obj, new_status, force=True)
+
 @admin.register(SwapSession)
 class SwapSessionAdmin(admin.ModelAdmin):
     list_display = ('swap_request', 'scheduled_date', 'completed', 'created_at')
@@ -16,3 +29,13 @@ class SwapSessionAdmin(admin.ModelAdmin):
 class SwapRatingAdmin(admin.ModelAdmin):
     list_display = ('swap_session', 'from_user', 'rating', 'created_at')
     list_filter = ('rating', 'created_at')
+
+class SwapCycleLegInline(admin.TabularInline):
+    model = SwapCycleLeg
+    extra = 0
+
+@admin.register(SwapCycle)
+class SwapCycleAdmin(admin.ModelAdmin):
+    list_display = ('signature', 'length', 'created_at')
+    list_filter = ('length', 'created_at')
+    inlines = [SwapCycleLegInline]
@@ -0,0 +1,68 @@
+"""
+Per-skill swap success rates.
+
+A swap counts towards a skill when the skill is offered or wanted in it.
+The offered and wanted sides are each one grouped query over the
+(skill_offered, status) and (skill_wanted, status) indexes. The combined
+figure subtracts a third grouped query for swaps that trade a skill for
+itself, so no swap is counted twice. That makes three aggregate queries
+plus one for skill names, however many skills there are.
+"""
+from django.db.models import Count, F, Q
+from skills.models import Skill
+from .models import SwapRequest
+
+SORT_KEYS = {
+    'success_rate': lambda stats: (stats['success_rate'], stats['total_swaps']),
+    'total_swaps': lambda stats: (stats['total_swaps'], stats['success_rate']),
+    'completed_swaps': lambda stats: (stats['completed_swaps'], stats['success_rate']),
+    'skill_name': lambda stats: stats['skill_name'].lower(),
+}
+
+def _grouped_counts(queryset, key):
+    rows = queryset.values(key).annotate(
+        total=Count('id'), completed=Count('id', filter=Q(status='completed'))
+    ).order_by()
+    return {row[key]: (row['total'], row['completed']) for row in rows}
+
+def _rate(completed, total):
+    return round(completed / total * 100, 2) if total else 0
+
+def _side(total, completed):
+    return {'total_swaps': total, 'completed_swaps': completed, 'success_rate': _rate(completed, total)}
+
+def skill_success_rates(sort='skill_name', min_swaps=0):
+    """
+    Success rates for every skill, combined and split by offered/wanted.
+    `sort` is a SORT_KEYS name, prefixed with '-' for descending.
+    """
+    offered = _grouped_counts(SwapRequest.objects.all(), 'skill_offered')
+    wanted = _grouped_counts(SwapRequest.objects.all(), 'skill_wanted')
+    same_skill = _grouped_counts(SwapRequest.objects.filter(skill_offered=F('skill_wanted')), 'skill_offered')
+
+    results = []
+    for skill_id, name, category in Skill.objects.order_by('name').values_list('id', 'name', 'category'):
+        offered_total, offered_completed = offered.get(skill_id, (0, 0))
+        wanted_total, wanted_completed = wanted.get(skill_id, (0, 0))
+        both_total, both_completed = same_skill.get(skill_id, (0, 0))
+        total = offered_total + wanted_total - both_total
+        if total < min_swaps:
+            continue
+        completed = offered_completed + wanted_completed - both_completed
+        results.append({
+            'skill_id': skill_id,
+            'skill_name': name,
+            'category': category,
+            'total_swaps': total,
+            'completed_swaps': completed,
+            'success_rate': _rate(completed, total),
+            'offered': _side(offered_total, offered_completed),
+            'wanted': _side(wanted_total, wanted_completed),
+        })
+
+    descending = sort.startswith('-')
+    sort_key = SORT_KEYS.get(sort.lstrip('-'))
+    if sort_key is None:
+        raise ValueError(f'Invalid sort "{sort}". Choose from: {", ".join(SORT_KEYS)}')
+    results.sort(key=sort_key, reverse=descending)
+    return results
@@ -0,0 +1,211 @@
+"""
+Multi-party swap cycle detection.
+
+The offered/wanted data in UserSkill forms a directed graph with an edge
+u -> v whenever u offers a skill v wants. A cycle of length 3 or 4 in that
+graph is a ring swap where nobody has a direct reciprocal partner but
+everybody still gets taught something.
+
+SkillGraph holds the graph as inverted indexes (skill -> offering users,
+skill -> wanting users) plus per-user skill sets, loaded from UserSkill for
+each pass. find_cycles() only starts a ring from its lowest user id, so a
+full pass over all users reports every ring exactly once, and the fanout cap
+bounds the work per start node on graphs with popular skills.
+
+Nobody is committed by a proposal. Each giver confirms their own leg with
+confirm_cycle_leg(), which creates that leg's SwapRequest; the other legs
+stay unconfirmed until their givers do the same.
+"""
+import time
+from collections import defaultdict
+from django.db import transaction
+from django.utils import timezone
+from skills.models import UserSkill
+from .models import SwapRequest, SwapCycle, SwapCycleLeg
+
+class SkillGraph:
+    def __init__(self):
+        self.offered_by = defaultdict(set)
+        self.wanted_by = defaultdict(set)
+        self.offers = defaultdict(set)
+        self.wants = defaultdict(set)
+
+    @classmethod
+    def load(cls, queryset=None):
+        if queryset is None:
+            queryset = UserSkill.objects.filter(user__is_active=True, user__is_banned=False)
+        graph = cls()
+        rows = queryset.values_list('user_id', 'skill_id', 'skill_type')
+        for user_id, skill_id, skill_type in rows.iterator(chunk_size=5000):
+            if skill_type == 'offered':
+                graph.offered_by[skill_id].add(user_id)
+                graph.offers[user_id].add(skill_id)
+            else:
+                graph.wanted_by[skill_id].add(user_id)
+                graph.wants[user_id].add(skill_id)
+        return graph
+
+    def user_ids(self):
+        return sorted(set(self.offers) & set(self.wants))
+
+    def successors(self, user_id, above, limit):
+        """Users with id > `above` that `user_id` can teach, mapped to the skill taught"""
+        result = {}
+        for skill_id in sorted(self.offers[user_id]):
+            for receiver in self.wanted_by[skill_id]:
+                if receiver > above and receiver != user_id and receiver not in result:
+                    result[receiver] = skill_id
+                    if len(result) >= limit:
+                        return result
+        return result
+
+    def predecessors(self, user_id, above):
+        """Users with id > `above` who can teach `user_id`, mapped to the skill taught"""
+        result = {}
+        for skill_id in sorted(self.wants[user_id]):
+            for giver in self.offered_by[skill_id]:
+                if giver > above and giver != user_id:
+                    result.setdefault(giver, skill_id)
+        return result
+
+    def edges_into(self, user_id, targets):
+        """Edges from `user_id` to any user in `targets`, one skill per target"""
+        result = {}
+        for skill_id in sorted(self.offers[user_id]):
+            for receiver in self.wanted_by[skill_id] & targets:
+                result.setdefault(receiver, skill_id)
+        return result
+
+def find_cycles(graph, start, max_length=4, fanout=50):
+    """
+    Yield rings through `start` in which `start` has the lowest user id.
+    Each ring is a list of (giver_id, receiver_id, skill_id) legs.
+    """
+    incoming = graph.predecessors(start, above=start)
+    if not incoming:
+        return
+    targets = set(incoming)
+
+    for second, first_skill in graph.successors(start, above=start, limit=fanout).items():
+        # start -> second -> third -> start
+        for third, second_skill in graph.edges_into(second, targets - {second}).items():
+            yield [
+                (start, second, first_skill),
+                (second, third, second_skill),
+                (third, start, incoming[third]),
+            ]
+
+        if max_length < 4:
+            continue
+
+        # start -> second -> middle -> fourth -> start
+        for middle, middle_skill in graph.successors(second, above=start, limit=fanout).items():
+            if middle == second:
+                continue
+            for fourth, fourth_skill in graph.edges_into(middle, targets - {second, middle}).items():
+                yield [
+                    (start, second, first_skill),
+                    (second, middle, middle_skill),
+                    (middle, fourth, fourth_skill),
+                    (fourth, start, incoming[fourth]),
+                ]
+
+def cycle_signature(legs):
+    return ','.join(f'{giver}:{skill}' for giver, _, skill in legs)
+
+def rebuild_swap_cycles(max_length=4, fanout=50, per_user=10, time_limit=None, batch_size=500):
+    """
+    Rescan the graph and replace the unconfirmed SwapCycle rows started by
+    each user, one batch of start users at a time, so a pass cut short by
+    `time_limit` leaves the proposals of users it never reached in place.
+    Returns (cycles_found, users_scanned, finished_within_time_limit).
+    """
+    deadline = time.monotonic() + time_limit if time_limit else None
+    started = timezone.now()
+    graph = SkillGraph.load()
+
+    batch, pending = [], []
+    found = scanned = 0
+    for user_id in graph.user_ids():
+        if deadline and time.monotonic() > deadline:
+            found += _replace_cycles(batch, pending)
+            return found, scanned, False
+        scanned += 1
+        batch.append(user_id)
+        for count, legs in enumerate(find_cycles(graph, user_id, max_length, fanout)):
+            if count >= per_user:
+                break
+            pending.append((cycle_signature(legs), legs))
+        if len(batch) >= batch_size:
+            found += _replace_cycles(batch, pending)
+            batch, pending = [], []
+
+    found += _replace_cycles(batch, pending)
+    # Users no longer in the graph were not rescanned; their old proposals are stale
+    unconfirmed(SwapCycle.objects.filter(created_at__lt=started)).delete()
+    return found, scanned, True
+
+def unconfirmed(cycles):
+    """Cycles none of whose legs has been confirmed"""
+    return cycles.exclude(legs__swap_request__isnull=False)
+
+@transaction.atomic
+def _replace_cycles(start_user_ids, pending):
+    """Swap the unconfirmed cycles started by `start_user_ids` (the lowest id in each ring) for `pending`"""
+    if not start_user_ids:
+        return 0
+    unconfirmed(SwapCycle.objects.filter(legs__position=0, legs__giver_id__in=start_user_ids)).delete()
+    kept = set(SwapCycle.objects.filter(
+        signature__in=[signature for signature, _ in pending]
+    ).values_list('signature', flat=True))
+    pending = [(signature, legs) for signature, legs in pending if signature not in kept]
+    if not pending:
+        return 0
+
+    cycles = SwapCycle.objects.bulk_create([
+        SwapCycle(length=len(legs), signature=signature) for signature, legs in pending
+    ])
+    SwapCycleLeg.objects.bulk_create([
+        SwapCycleLeg(
+            cycle=cycle, position=position, giver_id=giver, receiver_id=receiver, skill_id=skill,
+            # The previous leg (wrapping around) ends at this giver
+            received_skill_id=legs[position - 1][2]
+        )
+        for cycle, (_, legs) in zip(cycles, pending)
+        for position, (giver, receiver, skill) in enumerate(legs)
+    ])
+    return len(pending)
+
+def invalidate_cycles_for_skill(user_id, skill_id, skill_type):
+    """Drop unconfirmed cycles that relied on a UserSkill which no longer exists"""
+    if skill_type == 'offered':
+        legs = SwapCycleLeg.objects.filter(giver_id=user_id, skill_id=skill_id)
+    else:
+        legs = SwapCycleLeg.objects.filter(receiver_id=user_id, skill_id=skill_id)
+    unconfirmed(SwapCycle.objects.filter(id__in=legs.values('cycle_id'))).delete()
+
+class LegAlreadyConfirmed(Exception):
+    pass
+
+@transaction.atomic
+def confirm_cycle_leg(leg, message, duration, preferred_time):
+    """
+    Create the SwapRequest for one leg, sent by its giver: skill_offered is
+    what the giver teaches and skill_wanted is what the giver is taught in
+    the ring (leg.received_skill).
+    """
+    swap_request = SwapRequest.objects.create(
+        from_user_id=leg.giver_id,
+        to_user_id=leg.receiver_id,
+        skill_offered_id=leg.skill_id,
+        skill_wanted_id=leg.received_skill_id,
+        message=message,
+        duration=duration,
+        preferred_time=preferred_time,
+        cycle_id=leg.cycle_id,
+    )
+    # Conditional, so two confirmations of the same leg can't both succeed
+    if not SwapCycleLeg.objects.filter(pk=leg.pk, swap_request__isnull=True).update(swap_request=swap_request):
+        raise LegAlreadyConfirmed('You have already confirmed your part of this cycle')
+    leg.swap_request = swap_request
+    return swap_request
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from swaps.cycles import rebuild_swap_cycles
+
+class Command(BaseCommand):
+    help = 'Find multi-party swap rings (length 3-4) and store them as SwapCycle proposals'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-length', type=int, choices=[3, 4], default=4, help='Longest ring to look for')
+        parser.add_argument('--fanout', type=int, default=50, help='Max successors explored per user')
+        parser.add_argument('--per-user', type=int, default=10, help='Max rings started from one user')
+        parser.add_argument('--time-limit', type=int, default=600, help='Stop after this many seconds (0 = no limit)')
+
+    def handle(self, *args, **options):
+        found, scanned, finished = rebuild_swap_cycles(
+            max_length=options['max_length'],
+            fanout=options['fanout'],
+            per_user=options['per_user'],
+            time_limit=options['time_limit'] or None,
+        )
+        
+        if finished:
+            self.stdout.write(self.style.SUCCESS(f'Found {found} swap cycles across {scanned} users'))
+        else:
+            self.stdout.write(
+                self.style.WARNING(f'Time limit reached: found {found} swap cycles after {scanned} users')
+            )
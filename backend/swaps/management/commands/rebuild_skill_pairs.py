@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from swaps.pairs import rebuild_skill_pairs
+
+class Command(BaseCommand):
+    help = 'Recompute the skill-pair swap matrix from the swap requests'
+
+    def handle(self, *args, **options):
+        rows = rebuild_skill_pairs()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} skill pair rows'))
@@ -0,0 +1,94 @@
+import threading
+import uuid
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth import get_user_model
+from django.db import connection, OperationalError
+from skills.models import Skill
+from swaps.models import SwapRequest
+from swaps.transitions import transition_swap, InvalidTransition
+
+User = get_user_model()
+
+class Command(BaseCommand):
+    help = (
+        'Fire concurrent accept/complete transitions at the same swaps and check completed_swaps (bumped on accept) stays exact. '
+        'Creates and deletes real users, skills and swaps, so it only runs with DEBUG on'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--swaps', type=int, default=20, help='Number of swaps to race on')
+        parser.add_argument('--threads', type=int, default=8, help='Concurrent workers per swap')
+
+    def handle(self, *args, **options):
+        # The writes fire every rollup, search, co-occurrence and similarity signal
+        if not settings.DEBUG:
+            raise CommandError('stress_swap_transitions writes to the configured database; run it only with DEBUG on')
+        
+        tag = uuid.uuid4().hex[:8]
+        sender = User.objects.create_user(
+            username=f'stress-a-{tag}', email=f'stress-a-{tag}@example.com', password=uuid.uuid4().hex
+        )
+        recipient = User.objects.create_user(
+            username=f'stress-b-{tag}', email=f'stress-b-{tag}@example.com', password=uuid.uuid4().hex
+        )
+        skill = Skill.objects.create(name=f'stress-{tag}', category='other')
+
+        try:
+            swap_ids = [
+                SwapRequest.objects.create(
+                    from_user=sender, to_user=recipient, skill_offered=skill, skill_wanted=skill,
+                    message='stress test', duration='1hour', preferred_time='flexible'
+                ).id
+                for _ in range(options['swaps'])
+            ]
+
+            results = {'won': 0, 'lost': 0, 'errors': 0}
+            lock = threading.Lock()
+            barrier = threading.Barrier(options['threads'])
+
+            def worker():
+                barrier.wait()
+                try:
+                    for swap_id in swap_ids:
+                        for new_status in ('accepted', 'completed'):
+                            swap = SwapRequest.objects.get(pk=swap_id)
+                            try:
+                                transition_swap(swap, new_status)
+                                outcome = 'won'
+                            except InvalidTransition:
+                                outcome = 'lost'
+                            except OperationalError:
+                                outcome = 'errors'
+                            with lock:
+                                results[outcome] += 1
+                finally:
+                    connection.close()
+
+            threads = [threading.Thread(target=worker) for _ in range(options['threads'])]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            sender.refresh_from_db(fields=['completed_swaps'])
+            recipient.refresh_from_db(fields=['completed_swaps'])
+            # Every swap that got past 'pending' was accepted exactly once
+            accepted = SwapRequest.objects.filter(id__in=swap_ids, status__in=['accepted', 'completed']).count()
+
+            self.stdout.write(
+                f"Transitions won: {results['won']}, rejected as stale: {results['lost']}, "
+                f"database errors: {results['errors']}"
+            )
+            self.stdout.write(
+                f'Accepted swaps: {accepted}, counters: {sender.completed_swaps}/{recipient.completed_swaps}'
+            )
+
+            if sender.completed_swaps == recipient.completed_swaps == accepted:
+                self.stdout.write(self.style.SUCCESS('Counters match accepted swaps exactly'))
+            else:
+                self.stdout.write(self.style.ERROR('Counter drift detected'))
+        finally:
+            sender.delete()
+            recipient.delete()
+            skill.delete()
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-17 17:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('swaps', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='swaprequest',
+            index=models.Index(fields=['created_at', 'id'], name='swaprequest_created_id_idx'),
+        ),
+    ]
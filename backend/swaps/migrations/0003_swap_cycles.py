@@ -0,0 +1,49 @@
+# Generated by Django 4.2.30 on 2026-10-17 17:54
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('skills', '0002_userskill_inverted_index'),
+        ('swaps', '0002_created_id_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SwapCycle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('length', models.PositiveSmallIntegerField()),
+                ('signature', models.CharField(max_length=255, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='swaprequest',
+            name='cycle',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='swap_requests', to='swaps.swapcycle'),
+        ),
+        migrations.CreateModel(
+            name='SwapCycleLeg',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveSmallIntegerField()),
+                ('cycle', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='legs', to='swaps.swapcycle')),
+                ('giver', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cycle_legs_given', to=settings.AUTH_USER_MODEL)),
+                ('receiver', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cycle_legs_received', to=settings.AUTH_USER_MODEL)),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cycle_legs', to='skills.skill')),
+            ],
+            options={
+                'ordering': ['cycle', 'position'],
+                'unique_together': {('cycle', 'position')},
+            },
+        ),
+    ]
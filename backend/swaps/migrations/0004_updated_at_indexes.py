@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-17 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('swaps', '0003_swap_cycles'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='swaprating',
+            index=models.Index(fields=['created_at'], name='swaprating_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='swaprequest',
+            index=models.Index(fields=['updated_at'], name='swaprequest_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-17 18:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('swaps', '0004_updated_at_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='swaprequest',
+            index=models.Index(fields=['skill_offered', 'status'], name='swaprequest_offered_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='swaprequest',
+            index=models.Index(fields=['skill_wanted', 'status'], name='swaprequest_wanted_status_idx'),
+        ),
+    ]
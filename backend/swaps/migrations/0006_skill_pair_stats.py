@@ -0,0 +1,48 @@
+# Generated by Django 4.2.30 on 2026-10-17 18:13
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+import django.db.models.deletion
+
+
+def backfill_skill_pairs(apps, schema_editor):
+    SkillPairStat = apps.get_model('swaps', 'SkillPairStat')
+    rows = apps.get_model('swaps', 'SwapRequest').objects.values('skill_offered', 'skill_wanted').annotate(
+        total=Count('id'), completed=Count('id', filter=Q(status='completed'))
+    ).order_by()
+    SkillPairStat.objects.bulk_create(
+        [
+            SkillPairStat(
+                skill_offered_id=row['skill_offered'], skill_wanted_id=row['skill_wanted'],
+                total=row['total'], completed=row['completed']
+            )
+            for row in rows
+        ],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0002_userskill_inverted_index'),
+        ('swaps', '0005_skill_status_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillPairStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total', models.BigIntegerField(default=0)),
+                ('completed', models.BigIntegerField(default=0)),
+                ('skill_offered', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='skills.skill')),
+                ('skill_wanted', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='skills.skill')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-total'], name='skillpairstat_total_idx')],
+                'unique_together': {('skill_offered', 'skill_wanted')},
+            },
+        ),
+        migrations.RunPython(backfill_skill_pairs, migrations.RunPython.noop),
+    ]
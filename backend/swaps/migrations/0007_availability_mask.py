@@ -0,0 +1,40 @@
+# Generated by Django 4.2.30 on 2026-10-17 18:17
+
+from django.db import migrations, models
+
+
+PREFERRED_TIME_MASKS = {
+    'weekday-morning': 0b000001,
+    'weekday-afternoon': 0b000010,
+    'weekday-evening': 0b000100,
+    'weekend-morning': 0b001000,
+    'weekend-afternoon': 0b010000,
+    'weekend-evening': 0b100000,
+    'flexible': 0b111111,
+}
+
+
+def backfill_request_masks(apps, schema_editor):
+    SwapRequest = apps.get_model('swaps', 'SwapRequest')
+    for value, mask in PREFERRED_TIME_MASKS.items():
+        SwapRequest.objects.filter(preferred_time=value).update(availability_mask=mask)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('swaps', '0006_skill_pair_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='swaprequest',
+            name='availability_mask',
+            field=models.PositiveSmallIntegerField(default=63),
+        ),
+        migrations.AddIndex(
+            model_name='swaprequest',
+            index=models.Index(fields=['to_user', 'availability_mask'], name='swaprequest_to_avail_idx'),
+        ),
+        migrations.RunPython(backfill_request_masks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.30 on 2026-10-17 18:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_cycle_legs(apps, schema_editor):
+    SwapCycleLeg = apps.get_model('swaps', 'SwapCycleLeg')
+    SwapRequest = apps.get_model('swaps', 'SwapRequest')
+
+    # Each giver is taught by the giver of the leg that ends at them
+    taught = {
+        (cycle_id, receiver_id): skill_id
+        for cycle_id, receiver_id, skill_id in SwapCycleLeg.objects.values_list('cycle_id', 'receiver_id', 'skill_id')
+    }
+    requests = {
+        (cycle_id, from_user_id): request_id
+        for request_id, cycle_id, from_user_id in SwapRequest.objects.filter(cycle__isnull=False).values_list(
+            'id', 'cycle_id', 'from_user_id'
+        )
+    }
+    for leg in SwapCycleLeg.objects.all():
+        leg.received_skill_id = taught[(leg.cycle_id, leg.giver_id)]
+        leg.swap_request_id = requests.get((leg.cycle_id, leg.giver_id))
+        leg.save(update_fields=['received_skill', 'swap_request'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0003_skill_cooccurrence'),
+        ('swaps', '0007_availability_mask'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='swapcycleleg',
+            name='received_skill',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='cycle_legs_received', to='skills.skill'),
+        ),
+        migrations.AddField(
+            model_name='swapcycleleg',
+            name='swap_request',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='cycle_leg', to='swaps.swaprequest'),
+        ),
+        migrations.RunPython(backfill_cycle_legs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='swapcycleleg',
+            name='received_skill',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cycle_legs_received', to='skills.skill'),
+        ),
+    ]
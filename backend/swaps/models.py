@@ -1,6 +1,7 @@
 from django.db import models
 from django.conf import settings
 from skills.models import Skill
+from accounts.availability import ANY_TIME, preferred_time_mask
 
 class SwapRequest(models.Model):
     STATUS_CHOICES = [
@@ -52,15 +53,101 @@ class SwapRequest(models.Model):
     message = models.TextField()
     duration = models.CharField(max_length=20, choices=DURATION_CHOICES)
     preferred_time = models.CharField(max_length=30, choices=TIME_CHOICES)
+    # Day-part slots covered by `preferred_time` (see accounts/availability.py), set on save
+    availability_mask = models.PositiveSmallIntegerField(default=ANY_TIME)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    cycle = models.ForeignKey(
+        'SwapCycle',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='swap_requests'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='swaprequest_created_id_idx'),
+            models.Index(fields=['updated_at'], name='swaprequest_updated_idx'),
+            models.Index(fields=['skill_offered', 'status'], name='swaprequest_offered_status_idx'),
+            models.Index(fields=['skill_wanted', 'status'], name='swaprequest_wanted_status_idx'),
+            models.Index(fields=['to_user', 'availability_mask'], name='swaprequest_to_avail_idx'),
+        ]
     
     def __str__(self):
         return f"{self.from_user.full_name} -> {self.to_user.full_name}: {self.skill_offered.name} for {self.skill_wanted.name}"
+    
+    def save(self, *args, **kwargs):
+        self.availability_mask = preferred_time_mask(self.preferred_time)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'preferred_time' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'availability_mask'}
+        super().save(*args, **kwargs)
+
+class SwapCycle(models.Model):
+    """A multi-party ring (A teaches B, B teaches C, C teaches A) found by swaps.cycles"""
+    length = models.PositiveSmallIntegerField()
+    signature = models.CharField(max_length=255, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"Swap cycle {self.signature}"
+
+class SwapCycleLeg(models.Model):
+    """
+    One hop of a SwapCycle: giver teaches skill to receiver, and is taught
+    received_skill by the giver of the previous leg. swap_request is set
+    once the giver confirms their leg.
+    """
+    cycle = models.ForeignKey(SwapCycle, on_delete=models.CASCADE, related_name='legs')
+    position = models.PositiveSmallIntegerField()
+    giver = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='cycle_legs_given'
+    )
+    receiver = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='cycle_legs_received'
+    )
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='cycle_legs')
+    received_skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='cycle_legs_received')
+    swap_request = models.OneToOneField(
+        SwapRequest,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='cycle_leg'
+    )
+    
+    class Meta:
+        ordering = ['cycle', 'position']
+        unique_together = ['cycle', 'position']
+    
+    def __str__(self):
+        return f"{self.giver_id} -> {self.receiver_id}: {self.skill_id}"
+
+class SkillPairStat(models.Model):
+    """Swap counts for one (offered, wanted) skill pair, maintained by swaps.pairs"""
+    skill_offered = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='+')
+    skill_wanted = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='+')
+    total = models.BigIntegerField(default=0)
+    completed = models.BigIntegerField(default=0)
+    
+    class Meta:
+        unique_together = ['skill_offered', 'skill_wanted']
+        indexes = [
+            models.Index(fields=['-total'], name='skillpairstat_total_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.skill_offered_id} -> {self.skill_wanted_id}: {self.completed}/{self.total}"
 
 class SwapSession(models.Model):
     """Represents an actual skill swap session"""
@@ -83,6 +170,9 @@ class SwapRating(models.Model):
     
     class Meta:
         unique_together = ['swap_session', 'from_user']
+        indexes = [
+            models.Index(fields=['created_at'], name='swaprating_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.from_user.full_name} rated {self.rating} stars"
@@ -0,0 +1,136 @@
+"""
+Skill-pair trade matrix.
+
+SkillPairStat is a sparse matrix with one row per (skill_offered,
+skill_wanted) pair that has ever been requested. Each row holds the number of
+swaps for the pair and how many of them completed. Rows are kept current from
+swaps.signals on create, delete, skill edits and status saves, and from
+swaps.transitions for the conditional status UPDATEs. rebuild_skill_pairs()
+recomputes the table from SwapRequest.
+
+The analytics read this table, not SwapRequest, so their cost depends on
+the number of distinct pairs rather than the number of swaps. Responses
+are cached for SKILL_PAIR_STATS_TIMEOUT seconds.
+"""
+from django.apps import apps as global_apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, FloatField, Q, Sum
+from django.db.models.functions import Cast
+
+def bump_pair(skill_offered_id, skill_wanted_id, total=0, completed=0):
+    if not total and not completed:
+        return
+    SkillPairStat = global_apps.get_model('swaps', 'SkillPairStat')
+    pair = SkillPairStat.objects.filter(skill_offered_id=skill_offered_id, skill_wanted_id=skill_wanted_id)
+    if pair.update(total=F('total') + total, completed=F('completed') + completed):
+        return
+    try:
+        with transaction.atomic():
+            SkillPairStat.objects.create(
+                skill_offered_id=skill_offered_id, skill_wanted_id=skill_wanted_id,
+                total=total, completed=completed
+            )
+    except IntegrityError:
+        # Another writer created the row first
+        pair.update(total=F('total') + total, completed=F('completed') + completed)
+
+def record_pair_change(old, new):
+    """
+    Move one swap between matrix cells. `old` and `new` are
+    (skill_offered_id, skill_wanted_id, status) tuples, or None when the swap
+    is being created or deleted.
+    """
+    if old == new:
+        return
+    if old is not None and new is not None and old[:2] == new[:2]:
+        # Status change within one cell
+        bump_pair(new[0], new[1], completed=int(new[2] == 'completed') - int(old[2] == 'completed'))
+        return
+    if old is not None:
+        bump_pair(old[0], old[1], total=-1, completed=-int(old[2] == 'completed'))
+    if new is not None:
+        bump_pair(new[0], new[1], total=1, completed=int(new[2] == 'completed'))
+
+def rebuild_skill_pairs():
+    """Recompute every SkillPairStat row from SwapRequest"""
+    SkillPairStat = global_apps.get_model('swaps', 'SkillPairStat')
+    rows = global_apps.get_model('swaps', 'SwapRequest').objects.values('skill_offered', 'skill_wanted').annotate(
+        total=Count('id'), completed=Count('id', filter=Q(status='completed'))
+    ).order_by()
+    with transaction.atomic():
+        SkillPairStat.objects.all().delete()
+        SkillPairStat.objects.bulk_create(
+            [
+                SkillPairStat(
+                    skill_offered_id=row['skill_offered'], skill_wanted_id=row['skill_wanted'],
+                    total=row['total'], completed=row['completed']
+                )
+                for row in rows
+            ],
+            batch_size=1000
+        )
+    return len(rows)
+
+def _cached(key, compute):
+    result = cache.get(key)
+    if result is None:
+        result = compute()
+        cache.set(key, result, getattr(settings, 'SKILL_PAIR_STATS_TIMEOUT', 60))
+    return result
+
+def _pair_rows(queryset):
+    return [
+        {
+            'skill_offered': {'id': row['skill_offered'], 'name': row['skill_offered__name']},
+            'skill_wanted': {'id': row['skill_wanted'], 'name': row['skill_wanted__name']},
+            'total_swaps': row['total'],
+            'completed_swaps': row['completed'],
+            'conversion_rate': round(row['completed'] / row['total'] * 100, 2) if row['total'] else 0,
+        }
+        for row in queryset.values(
+            'skill_offered', 'skill_offered__name', 'skill_wanted', 'skill_wanted__name', 'total', 'completed'
+        )
+    ]
+
+def top_pairs(limit=20):
+    """Most requested pairs, read off the total index"""
+    SkillPairStat = global_apps.get_model('swaps', 'SkillPairStat')
+    return _cached(
+        f'skill_pairs:top:{limit}',
+        lambda: _pair_rows(SkillPairStat.objects.filter(total__gt=0).order_by('-total', 'id')[:limit])
+    )
+
+def best_converting_pairs(limit=20, min_swaps=5):
+    """Pairs with the highest completed/total ratio among those with at least `min_swaps` swaps"""
+    SkillPairStat = global_apps.get_model('swaps', 'SkillPairStat')
+    return _cached(
+        f'skill_pairs:conversion:{limit}:{min_swaps}',
+        lambda: _pair_rows(
+            SkillPairStat.objects.filter(total__gte=max(min_swaps, 1)).annotate(
+                rate=Cast('completed', FloatField()) / F('total')
+            ).order_by('-rate', '-total')[:limit]
+        )
+    )
+
+def category_flows():
+    """Swap and completion totals from each offered category to each wanted category"""
+    SkillPairStat = global_apps.get_model('swaps', 'SkillPairStat')
+
+    def compute():
+        rows = SkillPairStat.objects.values(
+            'skill_offered__category', 'skill_wanted__category'
+        ).annotate(total=Sum('total'), completed=Sum('completed')).filter(total__gt=0).order_by('-total')
+        return [
+            {
+                'from_category': row['skill_offered__category'],
+                'to_category': row['skill_wanted__category'],
+                'total_swaps': row['total'],
+                'completed_swaps': row['completed'],
+                'conversion_rate': round(row['completed'] / row['total'] * 100, 2),
+            }
+            for row in rows
+        ]
+
+    return _cached('skill_pairs:categories', compute)
@@ -1,6 +1,8 @@
 from rest_framework import serializers
-from .models import SwapRequest, SwapSession, SwapRating
+from django.contrib.auth import get_user_model
+from .models import SwapRequest, SwapSession, SwapRating, SwapCycle, SwapCycleLeg
 from accounts.serializers import UserProfileSerializer
+from skills.models import Skill
 from skills.serializers import SkillSerializer
 
 class SwapRequestSerializer(serializers.ModelSerializer):
@@ -16,6 +18,32 @@ class SwapRequestSerializer(serializers.ModelSerializer):
             'message', 'duration', 'preferred_time', 'status', 'created_at', 'updated_at'
         ]
 
+class SwapUserSummarySerializer(serializers.ModelSerializer):
+    full_name = serializers.ReadOnlyField()
+    
+    class Meta:
+        model = get_user_model()
+        fields = ['id', 'full_name', 'avatar']
+
+class SwapSkillSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Skill
+        fields = ['id', 'name']
+
+class SwapRequestListSerializer(serializers.ModelSerializer):
+    """Compact representation for list endpoints; use SwapRequestSerializer for a single swap"""
+    from_user = SwapUserSummarySerializer(read_only=True)
+    to_user = SwapUserSummarySerializer(read_only=True)
+    skill_offered = SwapSkillSummarySerializer(read_only=True)
+    skill_wanted = SwapSkillSummarySerializer(read_only=True)
+    
+    class Meta:
+        model = SwapRequest
+        fields = [
+            'id', 'from_user', 'to_user', 'skill_offered', 'skill_wanted',
+            'message', 'duration', 'preferred_time', 'status', 'created_at', 'updated_at'
+        ]
+
 class SwapRequestCreateSerializer(serializers.ModelSerializer):
     skill_offered_id = serializers.IntegerField()
     skill_wanted_id = serializers.IntegerField()
@@ -57,3 +85,33 @@ class SwapRatingSerializer(serializers.ModelSerializer):
     class Meta:
         model = SwapRating
         fields = ['id', 'from_user', 'rating', 'comment', 'created_at']
+
+class SwapCycleLegSerializer(serializers.ModelSerializer):
+    giver_name = serializers.CharField(source='giver.full_name', read_only=True)
+    receiver_name = serializers.CharField(source='receiver.full_name', read_only=True)
+    skill_name = serializers.CharField(source='skill.name', read_only=True)
+    received_skill_name = serializers.CharField(source='received_skill.name', read_only=True)
+    confirmed = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = SwapCycleLeg
+        fields = [
+            'position', 'giver', 'giver_name', 'receiver', 'receiver_name', 'skill', 'skill_name',
+            'received_skill', 'received_skill_name', 'confirmed'
+        ]
+    
+    def get_confirmed(self, obj):
+        return obj.swap_request_id is not None
+
+class SwapCycleSerializer(serializers.ModelSerializer):
+    legs = SwapCycleLegSerializer(many=True, read_only=True)
+    
+    class Meta:
+        model = SwapCycle
+        fields = ['id', 'length', 'legs', 'created_at']
+
+class SwapCycleRequestSerializer(serializers.Serializer):
+    """Details of the SwapRequest sent when a giver confirms their leg of a cycle"""
+    message = serializers.CharField()
+    duration = serializers.ChoiceField(choices=SwapRequest.DURATION_CHOICES)
+    preferred_time = serializers.ChoiceField(choices=SwapRequest.TIME_CHOICES)
@@ -0,0 +1,36 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from skills.models import UserSkill
+from .cycles import invalidate_cycles_for_skill
+from .models import SwapRequest
+from .pairs import record_pair_change
+
+@receiver(post_delete, sender=UserSkill)
+def user_skill_deleted(sender, instance, **kwargs):
+    invalidate_cycles_for_skill(instance.user_id, instance.skill_id, instance.skill_type)
+
+# Skill-pair matrix (see swaps/pairs.py)
+
+def pair_cell(swap_request):
+    return (swap_request.skill_offered_id, swap_request.skill_wanted_id, swap_request.status)
+
+@receiver(pre_save, sender=SwapRequest)
+def remember_pair_cell(sender, instance, update_fields=None, **kwargs):
+    # Read from the row being overwritten, not remembered at load time, so
+    # querysets that never save don't pay for it
+    instance._pair_cell = None
+    if update_fields is not None and not {'skill_offered', 'skill_wanted', 'status'} & set(update_fields):
+        # The save leaves the cell alone
+        instance._pair_cell = pair_cell(instance)
+    elif instance.pk is not None:
+        instance._pair_cell = sender.objects.filter(pk=instance.pk).values_list(
+            'skill_offered_id', 'skill_wanted_id', 'status'
+        ).first()
+
+@receiver(post_save, sender=SwapRequest)
+def count_pair(sender, instance, created, **kwargs):
+    record_pair_change(None if created else instance._pair_cell, pair_cell(instance))
+
+@receiver(post_delete, sender=SwapRequest)
+def uncount_pair(sender, instance, **kwargs):
+    record_pair_change(pair_cell(instance), None)
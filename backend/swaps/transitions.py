@@ -0,0 +1,81 @@
+"""
+Swap request status transitions.
+
+Every status change goes through transition_swap(), which applies it as a
+conditional UPDATE ... WHERE status = <expected source>. When two requests
+race for the same transition only one UPDATE matches a row, so side effects
+such as the completed_swaps counters, the daily stats rollups and the
+skill-pair matrix run exactly once. Counters are bumped with F() expressions
+that touch only their own column.
+
+completed_swaps keeps its original meaning: both users gain one each time
+a swap is accepted.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from accounts.histograms import invalidate_status_histogram
+from accounts.rollups import record_status_change
+from .models import SwapRequest
+from .pairs import record_pair_change
+
+TRANSITIONS = {
+    'pending': {'accepted', 'rejected', 'cancelled'},
+    'accepted': {'completed', 'cancelled'},
+    'rejected': set(),
+    'completed': set(),
+    'cancelled': set(),
+}
+
+class InvalidTransition(Exception):
+    pass
+
+def allowed_sources(new_status):
+    return [source for source, targets in TRANSITIONS.items() if new_status in targets]
+
+@transaction.atomic
+def transition_swap(swap_request, new_status, force=False):
+    """
+    Move `swap_request` to `new_status` and return the status it left.
+
+    Raises InvalidTransition if the swap is not (or no longer) in a state the
+    transition is allowed from. `force` lets admins move between any two
+    distinct statuses while still keeping the counters consistent.
+    """
+    if new_status not in TRANSITIONS:
+        raise InvalidTransition(f'Unknown status "{new_status}"')
+
+    if force:
+        sources = [source for source in TRANSITIONS if source != new_status]
+    else:
+        sources = allowed_sources(new_status)
+
+    now = timezone.now()
+    previous_status = None
+    for source in sources:
+        updated = SwapRequest.objects.filter(pk=swap_request.pk, status=source).update(
+            status=new_status, updated_at=now
+        )
+        if updated:
+            previous_status = source
+            break
+
+    if previous_status is None:
+        raise InvalidTransition(
+            f'Cannot change status from "{swap_request.status}" to "{new_status}"'
+        )
+
+    record_status_change('swaps', swap_request.created_at, previous_status, new_status)
+    invalidate_status_histogram(SwapRequest)
+    pair = (swap_request.skill_offered_id, swap_request.skill_wanted_id)
+    record_pair_change((*pair, previous_status), (*pair, new_status))
+    
+    if new_status == 'accepted':
+        get_user_model().objects.filter(
+            pk__in=[swap_request.from_user_id, swap_request.to_user_id]
+        ).update(completed_swaps=F('completed_swaps') + 1)
+
+    swap_request.status = new_status
+    swap_request.updated_at = now
+    return previous_status
@@ -4,5 +4,8 @@ from . import views
 urlpatterns = [
     path('requests/', views.SwapRequestListCreateView.as_view(), name='swap_requests'),
     path('requests/received/', views.ReceivedRequestsView.as_view(), name='received_requests'),
+    path('requests/<int:pk>/', views.SwapRequestDetailView.as_view(), name='swap_request_detail'),
     path('requests/<int:pk>/status/', views.update_request_status, name='update_request_status'),
+    path('cycles/', views.SwapCycleListView.as_view(), name='swap_cycles'),
+    path('cycles/<int:pk>/request/', views.request_swap_cycle, name='request_swap_cycle'),
 ]
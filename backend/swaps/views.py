@@ -1,17 +1,26 @@
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from django.db.models import Q
-from .models import SwapRequest
-from .serializers import SwapRequestSerializer, SwapRequestCreateSerializer
+from django.db.models import Q, Prefetch
+from .models import SwapRequest, SwapCycle, SwapCycleLeg
+from .serializers import (
+    SwapRequestSerializer, SwapRequestListSerializer, SwapRequestCreateSerializer,
+    SwapCycleSerializer, SwapCycleRequestSerializer
+)
+from .cycles import confirm_cycle_leg, LegAlreadyConfirmed
+from accounts.availability import compatible_masks
+from .transitions import transition_swap, InvalidTransition
+from skillswap.pagination import OptionalKeysetPaginationMixin
 
-class SwapRequestListCreateView(generics.ListCreateAPIView):
+SWAP_LIST_RELATED = ('from_user', 'to_user', 'skill_offered', 'skill_wanted')
+
+class SwapRequestListCreateView(OptionalKeysetPaginationMixin, generics.ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return SwapRequestCreateSerializer
-        return SwapRequestSerializer
+        return SwapRequestListSerializer
     
     def get_queryset(self):
         user = self.request.user
@@ -20,7 +29,7 @@ class SwapRequestListCreateView(generics.ListCreateAPIView):
         # Get requests sent by or received by the user
         queryset = SwapRequest.objects.filter(
             Q(from_user=user) | Q(to_user=user)
-        )
+        ).select_related(*SWAP_LIST_RELATED)
         
         if status_filter:
             queryset = queryset.filter(status=status_filter)
@@ -28,45 +37,86 @@ class SwapRequestListCreateView(generics.ListCreateAPIView):
         return queryset
 
 class ReceivedRequestsView(generics.ListAPIView):
-    serializer_class = SwapRequestSerializer
+    serializer_class = SwapRequestListSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
         user = self.request.user
         status_filter = self.request.query_params.get('status', None)
         
-        queryset = SwapRequest.objects.filter(to_user=user)
+        queryset = SwapRequest.objects.filter(to_user=user).select_related(*SWAP_LIST_RELATED)
         
         if status_filter:
             queryset = queryset.filter(status=status_filter)
+        
+        # ?available=true: only requests for a time the user can make
+        if self.request.query_params.get('available') == 'true':
+            queryset = queryset.filter(availability_mask__in=compatible_masks(user.availability_mask))
             
         return queryset
 
+class SwapRequestDetailView(generics.RetrieveAPIView):
+    """Full representation of a single swap, including both user profiles"""
+    serializer_class = SwapRequestSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get_queryset(self):
+        user = self.request.user
+        return SwapRequest.objects.filter(
+            Q(from_user=user) | Q(to_user=user)
+        ).select_related(*SWAP_LIST_RELATED)
+
 @api_view(['PATCH'])
 @permission_classes([permissions.IsAuthenticated])
 def update_request_status(request, pk):
     try:
         swap_request = SwapRequest.objects.get(pk=pk, to_user=request.user)
-        new_status = request.data.get('status')
-        
-        if new_status not in ['accepted', 'rejected']:
-            return Response(
-                {'error': 'Invalid status'}, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        swap_request.status = new_status
-        swap_request.save()
-        
-        # Update user statistics if accepted
-        if new_status == 'accepted':
-            swap_request.from_user.completed_swaps += 1
-            swap_request.to_user.completed_swaps += 1
-            swap_request.from_user.save()
-            swap_request.to_user.save()
-        
-        serializer = SwapRequestSerializer(swap_request)
-        return Response(serializer.data)
-        
     except SwapRequest.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
+    
+    new_status = request.data.get('status')
+    
+    if new_status not in ['accepted', 'rejected']:
+        return Response(
+            {'error': 'Invalid status'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        transition_swap(swap_request, new_status)
+    except InvalidTransition as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    serializer = SwapRequestSerializer(swap_request)
+    return Response(serializer.data)
+
+class SwapCycleListView(generics.ListAPIView):
+    """Ring swaps (3-4 users) the current user takes part in that still wait for a confirmation"""
+    serializer_class = SwapCycleSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get_queryset(self):
+        legs = SwapCycleLeg.objects.select_related('giver', 'receiver', 'skill', 'received_skill')
+        return SwapCycle.objects.filter(
+            legs__giver=self.request.user
+        ).filter(
+            legs__swap_request__isnull=True
+        ).distinct().prefetch_related(Prefetch('legs', queryset=legs)).order_by('length', '-created_at')
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def request_swap_cycle(request, pk):
+    """Confirm the current user's leg of a proposed cycle by sending its SwapRequest"""
+    try:
+        leg = SwapCycleLeg.objects.get(cycle_id=pk, giver=request.user)
+    except SwapCycleLeg.DoesNotExist:
+        return Response(status=status.HTTP_404_NOT_FOUND)
+    
+    serializer = SwapCycleRequestSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    try:
+        swap_request = confirm_cycle_leg(leg, **serializer.validated_data)
+    except LegAlreadyConfirmed as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response(SwapRequestSerializer(swap_request).data, status=status.HTTP_201_CREATED)